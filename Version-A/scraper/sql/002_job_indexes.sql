@@ -0,0 +1,35 @@
+-- Job Crawler Database Schema
+-- Version: 1.1.0
+-- Description: Composite and partial indexes for the job listing, digest and cleanup queries
+--
+-- CONCURRENTLY builds do not block writes on an existing database, but they
+-- cannot run inside a transaction block: apply this file with plain psql
+-- (e.g. psql -f 002_job_indexes.sql), not with psql -1 / --single-transaction.
+
+-- ============================================
+-- JOBS INDEXES
+-- ============================================
+
+-- Jobs for one company, newest first (get_all filtered by company)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_company_first_seen
+    ON jobs(company_id, first_seen_at DESC);
+
+-- Entry-level jobs, newest first (get_all / count with entry_level_only,
+-- and the dashboard's entry-level filter in web/src/app/api/jobs/route.ts).
+-- Partial, so it only holds the small entry-level slice of the table.
+-- The planner uses it for any query filtering on is_entry_level (= TRUE);
+-- check with:
+--   EXPLAIN SELECT id FROM jobs WHERE is_entry_level = TRUE
+--   ORDER BY first_seen_at DESC LIMIT 100;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_entry_level_first_seen
+    ON jobs(first_seen_at DESC)
+    WHERE is_entry_level = TRUE;
+
+-- Superseded by the indexes above: company_id is the leading column of
+-- idx_jobs_company_first_seen, and the old partial index keyed a constant
+DROP INDEX CONCURRENTLY IF EXISTS idx_jobs_company;
+DROP INDEX CONCURRENTLY IF EXISTS idx_jobs_entry_level;
+
+-- Retention cleanup and new-job lookups range-scan idx_jobs_first_seen
+-- (jobs(first_seen_at), created in 001_init.sql); NOW() - interval is not
+-- immutable, so a partial index on the cleanup predicate is not possible.
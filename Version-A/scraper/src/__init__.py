@@ -8,7 +8,7 @@ from .models import Job, Company
 from .scrapers import BambooHRScraper, create_scraper
 from .database import Database, CompanyRepository, JobRepository
 from .config import Config, get_config
-from .main import run_crawler, run_crawler_for_url
+from .main import run_crawler, run_crawler_async, run_crawler_for_url
 from .cleanup import cleanup_old_jobs
 from .digest import send_daily_digest
 
@@ -30,6 +30,7 @@ __all__ = [
     "get_config",
     # Main functions
     "run_crawler",
+    "run_crawler_async",
     "run_crawler_for_url",
     "cleanup_old_jobs",
     "send_daily_digest",
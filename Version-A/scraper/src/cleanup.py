@@ -7,7 +7,7 @@ This script can be run as a cron job or scheduled task.
 
 import argparse
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from .config import get_config
 from .database import Database, JobRepository
@@ -35,8 +35,8 @@ def cleanup_old_jobs(days: int | None = None, dry_run: bool = False) -> int:
             with db.cursor(commit=False) as cur:
                 cur.execute("""
                     SELECT COUNT(*) as count FROM jobs
-                    WHERE first_seen_at < NOW() - INTERVAL '%s days'
-                """, (retention_days,))
+                    WHERE first_seen_at < %s
+                """, (datetime.now(timezone.utc) - timedelta(days=retention_days),))
                 row = cur.fetchone()
                 return row["count"] if row else 0
         else:
@@ -5,19 +5,131 @@ Handles database connections and CRUD operations for jobs and companies.
 Uses the Repository pattern for clean separation of concerns.
 """
 
+import atexit
+import csv
+import io
+import itertools
+import threading
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
-from typing import Generator, Optional
+from typing import Generator, Iterator, Optional
 
+import orjson
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 
 from .config import get_config, DatabaseConfig
 from .models import Job, Company
 
 
+# Hot statements, prepared once per pooled connection and run with EXECUTE
+PREPARED_STATEMENTS = {
+    "stmt_get_company_by_url": """
+        SELECT id, name, careers_url, platform, created_at, last_crawled_at
+        FROM companies
+        WHERE careers_url = $1
+    """,
+    "stmt_update_last_crawled": """
+        UPDATE companies
+        SET last_crawled_at = NOW()
+        WHERE id = $1
+    """,
+    "stmt_update_last_crawled_many": """
+        UPDATE companies
+        SET last_crawled_at = NOW()
+        WHERE id = ANY($1::integer[])
+    """,
+}
+
+
+class _PooledConnection(psycopg2.extensions.connection):
+    """Connection that remembers whether PREPARED_STATEMENTS were prepared on it."""
+    
+    statements_prepared = False
+
+
+# Seconds a thread waits for a free pooled connection before giving up
+POOL_CHECKOUT_TIMEOUT_SECONDS = 30
+
+
+class _BlockingConnectionPool(ThreadedConnectionPool):
+    """
+    ThreadedConnectionPool whose getconn waits for a free connection.
+    
+    The base pool raises PoolError as soon as all maxconn connections are
+    leased; here callers queue on a semaphore instead and only get
+    PoolError after POOL_CHECKOUT_TIMEOUT_SECONDS.
+    """
+    
+    def __init__(self, minconn: int, maxconn: int, *args, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self._slots = threading.BoundedSemaphore(maxconn)
+    
+    def getconn(self, key=None):
+        if not self._slots.acquire(timeout=POOL_CHECKOUT_TIMEOUT_SECONDS):
+            raise PoolError("timed out waiting for a pooled connection")
+        try:
+            return super().getconn(key)
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._slots.release()
+
+
+# Connection pools, one per database URL, shared by every Database instance
+_pools: dict[str, ThreadedConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+# Unique names for server-side (streaming) cursors
+_stream_ids = itertools.count()
+
+
+def _get_pool(config: DatabaseConfig) -> ThreadedConnectionPool:
+    """
+    Get the connection pool for a database, creating it on first use.
+    
+    Args:
+        config: Database configuration
+        
+    Returns:
+        Thread-safe pool of open connections to that database; checkout
+        waits while all of them are leased
+    """
+    key = config.connection_url
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _BlockingConnectionPool(
+                1,
+                config.pool_max,
+                host=config.host,
+                port=config.port,
+                dbname=config.name,
+                user=config.user,
+                password=config.password,
+                connection_factory=_PooledConnection,
+            )
+            _pools[key] = pool
+        return pool
+
+
+@atexit.register
+def close_pools() -> None:
+    """Close every pooled connection."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
+
+
 class Database:
-    """Database connection manager."""
+    """Database connection manager, leasing connections from a shared pool."""
     
     def __init__(self, config: Optional[DatabaseConfig] = None):
         """
@@ -30,36 +142,60 @@ class Database:
         self._connection: Optional[psycopg2.extensions.connection] = None
     
     def connect(self) -> psycopg2.extensions.connection:
-        """Get or create database connection."""
+        """Get or lease a database connection."""
         if self._connection is None or self._connection.closed:
-            self._connection = psycopg2.connect(
-                host=self.config.host,
-                port=self.config.port,
-                dbname=self.config.name,
-                user=self.config.user,
-                password=self.config.password,
-            )
+            pool = _get_pool(self.config)
+            if self._connection is not None:
+                # Dropped by the server: discard it instead of reusing it
+                pool.putconn(self._connection, close=True)
+            self._connection = pool.getconn()
+            if not self._connection.statements_prepared:
+                self._prepare_statements(self._connection)
         return self._connection
     
+    @staticmethod
+    def _prepare_statements(conn: _PooledConnection) -> None:
+        """Prepare PREPARED_STATEMENTS on a freshly opened connection."""
+        with conn.cursor() as cur:
+            for name, query in PREPARED_STATEMENTS.items():
+                cur.execute(f"PREPARE {name} AS {query}")
+        conn.commit()
+        conn.statements_prepared = True
+    
     def close(self) -> None:
-        """Close database connection."""
-        if self._connection and not self._connection.closed:
-            self._connection.close()
+        """Return the connection to the pool (rolling back any open transaction)."""
+        if self._connection is not None:
+            _get_pool(self.config).putconn(self._connection, close=self._connection.closed)
             self._connection = None
     
     @contextmanager
-    def cursor(self, commit: bool = True) -> Generator[RealDictCursor, None, None]:
+    def cursor(
+        self,
+        commit: bool = True,
+        dict_rows: bool = True,
+        itersize: Optional[int] = None,
+    ) -> Generator[psycopg2.extensions.cursor, None, None]:
         """
         Context manager for database cursor.
         
         Args:
             commit: Whether to commit after the block (default True)
+            dict_rows: Return rows as dicts (default True). Pass False for
+                       plain tuples, which are much cheaper on large reads.
+            itersize: Stream results through a server-side cursor, fetching
+                      this many rows per round-trip while iterating. Only
+                      one query can be executed on such a cursor.
             
         Yields:
-            Database cursor with dict-like row access
+            Database cursor with dict-like (or tuple) row access
         """
         conn = self.connect()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cursor_factory = RealDictCursor if dict_rows else None
+        if itersize:
+            cur = conn.cursor(name=f"stream_{next(_stream_ids)}", cursor_factory=cursor_factory)
+            cur.itersize = itersize
+        else:
+            cur = conn.cursor(cursor_factory=cursor_factory)
         try:
             yield cur
             if commit:
@@ -86,43 +222,39 @@ class CompanyRepository:
     
     def get_all_active(self) -> list[Company]:
         """Get all active companies."""
-        with self.db.cursor(commit=False) as cur:
+        with self.db.cursor(commit=False, dict_rows=False) as cur:
             cur.execute("""
                 SELECT id, name, careers_url, platform, created_at, last_crawled_at
                 FROM companies
                 WHERE is_active = TRUE
                 ORDER BY name
             """)
-            rows = cur.fetchall()
             return [
                 Company(
-                    id=row["id"],
-                    name=row["name"],
-                    careers_url=row["careers_url"],
-                    platform=row["platform"],
-                    created_at=row["created_at"],
-                    last_crawled_at=row["last_crawled_at"],
+                    id=company_id,
+                    name=name,
+                    careers_url=careers_url,
+                    platform=platform,
+                    created_at=created_at,
+                    last_crawled_at=last_crawled_at,
                 )
-                for row in rows
+                for company_id, name, careers_url, platform, created_at, last_crawled_at in cur
             ]
     
     def get_by_url(self, careers_url: str) -> Optional[Company]:
         """Get company by careers URL."""
-        with self.db.cursor(commit=False) as cur:
-            cur.execute("""
-                SELECT id, name, careers_url, platform, created_at, last_crawled_at
-                FROM companies
-                WHERE careers_url = %s
-            """, (careers_url,))
+        with self.db.cursor(commit=False, dict_rows=False) as cur:
+            cur.execute("EXECUTE stmt_get_company_by_url (%s)", (careers_url,))
             row = cur.fetchone()
             if row:
+                company_id, name, careers_url, platform, created_at, last_crawled_at = row
                 return Company(
-                    id=row["id"],
-                    name=row["name"],
-                    careers_url=row["careers_url"],
-                    platform=row["platform"],
-                    created_at=row["created_at"],
-                    last_crawled_at=row["last_crawled_at"],
+                    id=company_id,
+                    name=name,
+                    careers_url=careers_url,
+                    platform=platform,
+                    created_at=created_at,
+                    last_crawled_at=last_crawled_at,
                 )
             return None
     
@@ -142,11 +274,53 @@ class CompanyRepository:
     def update_last_crawled(self, company_id: int) -> None:
         """Update the last_crawled_at timestamp for a company."""
         with self.db.cursor() as cur:
-            cur.execute("""
-                UPDATE companies
-                SET last_crawled_at = NOW()
-                WHERE id = %s
-            """, (company_id,))
+            cur.execute("EXECUTE stmt_update_last_crawled (%s)", (company_id,))
+    
+    def update_last_crawled_many(self, company_ids: list[int]) -> None:
+        """Update the last_crawled_at timestamp for many companies in one statement."""
+        if not company_ids:
+            return
+        
+        with self.db.cursor() as cur:
+            cur.execute("EXECUTE stmt_update_last_crawled_many (%s)", (list(company_ids),))
+
+
+# Columns written by the job upserts, in _job_row order
+JOB_UPSERT_COLUMNS = (
+    "company_id", "external_id", "title", "category", "location",
+    "employment_type", "url", "is_entry_level", "posted_at",
+)
+
+# Conflict handling shared by upsert_many and upsert_many_copy
+JOB_UPSERT_CONFLICT_SQL = """
+    ON CONFLICT (company_id, external_id) DO UPDATE
+    SET title = EXCLUDED.title,
+        category = EXCLUDED.category,
+        location = EXCLUDED.location,
+        employment_type = EXCLUDED.employment_type,
+        url = EXCLUDED.url,
+        is_entry_level = EXCLUDED.is_entry_level
+    RETURNING id, (xmax = 0) AS is_new
+"""
+
+
+# NULL marker for COPY in CSV format (see JobRepository.upsert_many_copy)
+_COPY_NULL = r"\N"
+
+
+def _job_row(job: Job, company_id: int) -> tuple:
+    """Build the JOB_UPSERT_COLUMNS tuple for a job."""
+    return (
+        company_id,
+        job.external_id,
+        job.title,
+        job.category,
+        job.location,
+        job.employment_type,
+        job.url,
+        job.is_entry_level,
+        job.posted_at,
+    )
 
 
 class JobRepository:
@@ -160,7 +334,8 @@ class JobRepository:
         Insert or update a job (upsert).
         
         Uses external_id for deduplication. If job exists, updates it.
-        If job is new, inserts it.
+        If job is new, inserts it. Runs as a single INSERT ... ON CONFLICT
+        statement (see upsert_many), so it costs one round-trip.
         
         Args:
             job: The job to upsert
@@ -169,57 +344,83 @@ class JobRepository:
         Returns:
             Tuple of (job_id, is_new) where is_new indicates if this was an insert
         """
-        with self.db.cursor() as cur:
-            # Try to find existing job
-            cur.execute("""
-                SELECT id, first_seen_at FROM jobs
-                WHERE company_id = %s AND external_id = %s
-            """, (company_id, job.external_id))
-            existing = cur.fetchone()
+        return self.upsert_many([job], company_id)[0]
+    
+    def upsert_many(self, jobs: list[Job], company_id: int) -> list[tuple[int, bool]]:
+        """
+        Insert or update a batch of jobs for one company in a single statement.
+        
+        All rows are written in one transaction, so a failure rolls back the
+        whole batch.
+        
+        Args:
+            jobs: The jobs to upsert
+            company_id: The company ID
             
-            if existing:
-                # Update existing job (title/location might have changed)
-                cur.execute("""
-                    UPDATE jobs
-                    SET title = %s,
-                        category = %s,
-                        location = %s,
-                        employment_type = %s,
-                        url = %s,
-                        is_entry_level = %s
-                    WHERE id = %s
-                """, (
-                    job.title,
-                    job.category,
-                    job.location,
-                    job.employment_type,
-                    job.url,
-                    job.is_entry_level,
-                    existing["id"],
-                ))
-                return existing["id"], False
-            else:
-                # Insert new job
-                cur.execute("""
-                    INSERT INTO jobs (
-                        company_id, external_id, title, category, location,
-                        employment_type, url, is_entry_level, posted_at
-                    )
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    RETURNING id
-                """, (
-                    company_id,
-                    job.external_id,
-                    job.title,
-                    job.category,
-                    job.location,
-                    job.employment_type,
-                    job.url,
-                    job.is_entry_level,
-                    job.posted_at,
-                ))
-                row = cur.fetchone()
-                return row["id"], True
+        Returns:
+            List of (job_id, is_new) tuples, one per job
+        """
+        if not jobs:
+            return []
+        
+        rows = [_job_row(job, company_id) for job in jobs]
+        
+        with self.db.cursor(dict_rows=False) as cur:
+            result = execute_values(cur, f"""
+                INSERT INTO jobs ({", ".join(JOB_UPSERT_COLUMNS)})
+                VALUES %s
+            """ + JOB_UPSERT_CONFLICT_SQL, rows, page_size=500, fetch=True)
+            return [(job_id, is_new) for job_id, is_new in result]
+    
+    def upsert_many_copy(self, jobs: list[Job], company_id: int) -> list[tuple[int, bool]]:
+        """
+        Insert or update a large batch of jobs for one company via COPY.
+        
+        Rows are streamed into a temporary staging table with COPY, then
+        merged into jobs with a single INSERT ... SELECT ... ON CONFLICT.
+        Worth it for big batches such as the first crawl of a company;
+        upsert_many is cheaper for small ones.
+        
+        Args:
+            jobs: The jobs to upsert
+            company_id: The company ID
+            
+        Returns:
+            List of (job_id, is_new) tuples, one per distinct external_id
+            (not in input order)
+        """
+        if not jobs:
+            return []
+        
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        # None goes out as the explicit NULL marker: in CSV an empty field
+        # would be NULL too, turning '' values into NULLs that upsert_many
+        # stores as ''
+        writer.writerows(
+            tuple(_COPY_NULL if value is None else value for value in _job_row(job, company_id))
+            for job in jobs
+        )
+        buffer.seek(0)
+        
+        columns = ", ".join(JOB_UPSERT_COLUMNS)
+        with self.db.cursor(dict_rows=False) as cur:
+            # Column-only copy of jobs: no defaults (so no id sequence use)
+            cur.execute(f"""
+                CREATE TEMP TABLE stage_jobs ON COMMIT DROP AS
+                SELECT {columns} FROM jobs WITH NO DATA
+            """)
+            cur.copy_expert(
+                f"COPY stage_jobs ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')",
+                buffer,
+            )
+            # DISTINCT ON: ON CONFLICT DO UPDATE cannot touch a row twice
+            cur.execute(f"""
+                INSERT INTO jobs ({columns})
+                SELECT DISTINCT ON (external_id) {columns}
+                FROM stage_jobs
+            """ + JOB_UPSERT_CONFLICT_SQL)
+            return [(job_id, is_new) for job_id, is_new in cur.fetchall()]
     
     def get_all(
         self,
@@ -239,31 +440,66 @@ class JobRepository:
             List of job dictionaries with company info
         """
         with self.db.cursor(commit=False) as cur:
-            query = """
-                SELECT 
-                    j.id, j.title, j.category, j.location, j.employment_type,
-                    j.url, j.is_entry_level, j.first_seen_at, j.created_at,
-                    c.name as company_name, c.id as company_id
-                FROM jobs j
-                JOIN companies c ON j.company_id = c.id
-                WHERE 1=1
-            """
-            params: list = []
-            
-            if entry_level_only:
-                query += " AND j.is_entry_level = TRUE"
-            
-            if company_id is not None:
-                query += " AND j.company_id = %s"
-                params.append(company_id)
-            
-            query += " ORDER BY j.first_seen_at DESC LIMIT %s"
-            params.append(limit)
-            
-            cur.execute(query, params)
+            cur.execute(*self._get_all_query(entry_level_only, company_id, limit))
             return list(cur.fetchall())
     
-    def get_new_jobs(self, hours: int = 24) -> list[dict]:
+    def get_all_json(
+        self,
+        entry_level_only: bool = False,
+        company_id: Optional[int] = None,
+        limit: int = 100,
+    ) -> bytes:
+        """
+        Get the same jobs as `get_all`, already serialized to a JSON array.
+        
+        Meant to be written straight into an HTTP response body. Rows are
+        read as tuples and encoded with orjson, which also handles the
+        timestamp columns (as ISO 8601 strings).
+        
+        Args:
+            entry_level_only: Only return entry-level jobs
+            company_id: Filter by company ID
+            limit: Maximum number of jobs to return
+            
+        Returns:
+            UTF-8 encoded JSON array of job objects with company info
+        """
+        with self.db.cursor(commit=False, dict_rows=False) as cur:
+            cur.execute(*self._get_all_query(entry_level_only, company_id, limit))
+            columns = [column.name for column in cur.description]
+            return orjson.dumps([dict(zip(columns, row)) for row in cur])
+    
+    @staticmethod
+    def _get_all_query(
+        entry_level_only: bool,
+        company_id: Optional[int],
+        limit: int,
+    ) -> tuple[str, list]:
+        """Build the query and parameters shared by get_all and get_all_json."""
+        query = """
+            SELECT 
+                j.id, j.title, j.category, j.location, j.employment_type,
+                j.url, j.is_entry_level, j.first_seen_at, j.created_at,
+                c.name as company_name, c.id as company_id
+            FROM jobs j
+            JOIN companies c ON j.company_id = c.id
+            WHERE 1=1
+        """
+        params: list = []
+        
+        if entry_level_only:
+            query += " AND j.is_entry_level = TRUE"
+        
+        if company_id is not None:
+            query += " AND j.company_id = %s"
+            params.append(company_id)
+        
+        query += " ORDER BY j.first_seen_at DESC LIMIT %s"
+        params.append(limit)
+        
+        return query, params
+    
+    def get_new_jobs(self, hours: int = 24) -> list[Job]:
         """
         Get jobs first seen within the last N hours.
         
@@ -271,37 +507,96 @@ class JobRepository:
             hours: Number of hours to look back (default 24)
             
         Returns:
-            List of new job dictionaries with company info
+            List of new jobs with company name
         """
-        with self.db.cursor(commit=False) as cur:
-            cur.execute("""
+        return list(self.iter_new_jobs(hours))
+    
+    def iter_new_jobs(self, hours: int = 24, entry_level_first: bool = False) -> Iterator[Job]:
+        """
+        Yield jobs first seen within the last N hours, one at a time.
+        
+        Args:
+            hours: Number of hours to look back (default 24)
+            entry_level_first: Order entry-level jobs before all others
+            
+        Yields:
+            New jobs with company name, newest first (within each group)
+        """
+        order_by = "j.is_entry_level DESC, j.first_seen_at DESC" if entry_level_first else "j.first_seen_at DESC"
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+        
+        # Server-side cursor: rows arrive in chunks as the caller iterates,
+        # so a large lookback window never sits in memory all at once
+        with self.db.cursor(commit=False, dict_rows=False, itersize=1000) as cur:
+            # Selected in JOB_ROW_COLUMNS order, as Job.from_db_row expects
+            cur.execute(f"""
                 SELECT 
-                    j.id, j.title, j.category, j.location, j.employment_type,
-                    j.url, j.is_entry_level, j.first_seen_at,
-                    c.name as company_name
+                    j.title, j.url, j.external_id, c.name as company_name,
+                    j.category, j.location, j.employment_type,
+                    j.is_entry_level, j.first_seen_at
                 FROM jobs j
                 JOIN companies c ON j.company_id = c.id
-                WHERE j.first_seen_at >= NOW() - INTERVAL '%s hours'
-                ORDER BY j.first_seen_at DESC
-            """, (hours,))
-            return list(cur.fetchall())
+                WHERE j.first_seen_at >= %s
+                ORDER BY {order_by}
+            """, (cutoff,))
+            for row in cur:
+                yield Job.from_db_row(row)
+    
+    def count_new_jobs(self, hours: int = 24) -> tuple[int, int]:
+        """
+        Count jobs first seen within the last N hours.
+        
+        Args:
+            hours: Number of hours to look back (default 24)
+            
+        Returns:
+            Tuple of (total, entry_level) counts
+        """
+        with self.db.cursor(commit=False, dict_rows=False) as cur:
+            cur.execute("""
+                SELECT COUNT(*), COUNT(*) FILTER (WHERE is_entry_level)
+                FROM jobs
+                WHERE first_seen_at >= %s
+            """, (datetime.now(timezone.utc) - timedelta(hours=hours),))
+            total, entry_level = cur.fetchone()
+            return total, entry_level
     
-    def delete_old_jobs(self, days: int = 7) -> int:
+    def delete_old_jobs(self, days: int = 7, batch_size: Optional[int] = None) -> int:
         """
         Delete jobs older than N days.
         
+        Rows are deleted in batches, each committed in its own transaction,
+        so locks are held briefly and an interrupted run can simply resume.
+        
         Args:
             days: Number of days after which to delete jobs
+            batch_size: Rows per batch. Uses config default if None.
             
         Returns:
             Number of jobs deleted
         """
-        with self.db.cursor() as cur:
-            cur.execute("""
-                DELETE FROM jobs
-                WHERE first_seen_at < NOW() - INTERVAL '%s days'
-            """, (days,))
-            return cur.rowcount
+        batch_size = batch_size or get_config().cleanup_batch_size
+        # Fixed up front so every batch deletes against the same cutoff
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        
+        total = 0
+        while True:
+            with self.db.cursor() as cur:
+                cur.execute("""
+                    WITH batch AS (
+                        SELECT id FROM jobs
+                        WHERE first_seen_at < %s
+                        ORDER BY first_seen_at
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    DELETE FROM jobs USING batch
+                    WHERE jobs.id = batch.id
+                """, (cutoff, batch_size))
+                deleted = cur.rowcount
+            total += deleted
+            if deleted < batch_size:
+                return total
     
     def count(self, entry_level_only: bool = False) -> int:
         """Get total job count."""
@@ -7,19 +7,19 @@ Fetches new jobs found in the last 24 hours and sends an email digest.
 import argparse
 import sys
 from datetime import datetime
+from typing import Sequence
 
 from .config import get_config
 from .database import Database, JobRepository
-from .models import Job
 from .notifications import get_notification_service
 
 
-def send_daily_digest(email: str, hours: int = 24) -> int:
+def send_daily_digest(emails: Sequence[str], hours: int = 24) -> int:
     """
     Find new jobs and send digest.
     
     Args:
-        email: Recipient email address
+        emails: Recipient email addresses
         hours: Lookback window in hours
         
     Returns:
@@ -27,45 +27,34 @@ def send_daily_digest(email: str, hours: int = 24) -> int:
     """
     with Database() as db:
         repo = JobRepository(db)
-        new_jobs_data = repo.get_new_jobs(hours=hours)
-        
-        # Convert dicts back to Job objects for the template
-        jobs = []
-        for d in new_jobs_data:
-            job = Job(
-                title=d['title'],
-                url=d['url'],
-                external_id='', # Not needed for display
-                company_name=d['company_name'],
-                category=d['category'],
-                location=d['location'],
-                employment_type=d['employment_type'],
-                is_entry_level=d['is_entry_level'],
-                first_seen_at=d['first_seen_at']
-            )
-            jobs.append(job)
+        total_count, entry_level_count = repo.count_new_jobs(hours=hours)
             
-        if not jobs:
+        if not total_count:
             print(f"No new jobs found in the last {hours} hours.")
             return 0
             
-        print(f"Found {len(jobs)} new jobs. Sending email to {email}...")
+        print(f"Found {total_count} new jobs. Sending email to {', '.join(emails)}...")
         
+        # Jobs are streamed from the database into the template
+        jobs = repo.iter_new_jobs(hours=hours, entry_level_first=True)
         service = get_notification_service()
-        service.send_digest(email, jobs)
+        if len(emails) == 1:
+            service.send_digest(emails[0], jobs, total_count, entry_level_count)
+        else:
+            service.send_digest_many(emails, jobs, total_count, entry_level_count)
         
-        return len(jobs)
+        return total_count
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Send daily job digest email")
-    parser.add_argument("email", help="Recipient email address")
+    parser.add_argument("emails", nargs="+", help="Recipient email addresses")
     parser.add_argument("--hours", type=int, default=24, help="Lookback hours (default: 24)")
     
     args = parser.parse_args()
     
     try:
-        count = send_daily_digest(args.email, args.hours)
+        count = send_daily_digest(args.emails, args.hours)
         print(f"Digest complete. Sent {count} jobs.")
         return 0
     except Exception as e:
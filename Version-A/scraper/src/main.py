@@ -6,48 +6,168 @@ Phase 2: Now integrates with PostgreSQL database for persistence.
 """
 
 import argparse
+import asyncio
 import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from typing import Optional
+from urllib.parse import urlparse
 
-from .scrapers import create_scraper
-from .models import Job
+import httpx
+
+from .config import get_config
+from .scrapers import DEFAULT_HEADERS, REQUEST_TIMEOUT_SECONDS, RETRY_ATTEMPTS, create_scraper
+from .models import Company, Job
 from .database import Database, CompanyRepository, JobRepository
 
 
+# Result of fetching a single company: (company, jobs, error)
+FetchResult = tuple[Company, list[Job], Optional[Exception]]
+
+
 def print_job_summary(jobs: list[Job], company_name: str, new_count: int = 0) -> None:
     """Print a formatted summary of jobs found."""
-    print(f"\n{'='*60}")
-    print(f"  {company_name.upper()} - {len(jobs)} job(s) found")
+    # Build the whole summary first and write it to stdout in one call
+    lines = [
+        f"\n{'='*60}",
+        f"  {company_name.upper()} - {len(jobs)} job(s) found",
+    ]
     if new_count > 0:
-        print(f"  NEW: {new_count} job(s) added to database")
-    print(f"{'='*60}\n")
+        lines.append(f"  NEW: {new_count} job(s) added to database")
+    lines.append(f"{'='*60}\n")
     
     if not jobs:
-        print("  No jobs found.\n")
+        lines.append("  No jobs found.\n")
+        sys.stdout.write("\n".join(lines) + "\n")
         return
     
-    entry_level_jobs = [j for j in jobs if j.is_entry_level]
-    other_jobs = [j for j in jobs if not j.is_entry_level]
+    # Split in a single pass
+    entry_level_jobs: list[Job] = []
+    other_jobs: list[Job] = []
+    for job in jobs:
+        (entry_level_jobs if job.is_entry_level else other_jobs).append(job)
     
     if entry_level_jobs:
-        print(f"  ENTRY-LEVEL / NEW GRAD ROLES ({len(entry_level_jobs)}):")
-        print(f"  {'-'*40}")
-        for job in entry_level_jobs:
-            location = f" | {job.location}" if job.location else ""
-            category = f" | {job.category}" if job.category else ""
-            print(f"  * {job.title}{category}{location}")
-            print(f"    {job.url}")
-            print()
+        lines.append(f"  ENTRY-LEVEL / NEW GRAD ROLES ({len(entry_level_jobs)}):")
+        lines.append(f"  {'-'*40}")
+        lines.extend(_format_job(job, "*") for job in entry_level_jobs)
     
     if other_jobs:
-        print(f"  OTHER ROLES ({len(other_jobs)}):")
-        print(f"  {'-'*40}")
-        for job in other_jobs:
-            location = f" | {job.location}" if job.location else ""
-            category = f" | {job.category}" if job.category else ""
-            print(f"  - {job.title}{category}{location}")
-            print(f"    {job.url}")
-            print()
+        lines.append(f"  OTHER ROLES ({len(other_jobs)}):")
+        lines.append(f"  {'-'*40}")
+        lines.extend(_format_job(job, "-") for job in other_jobs)
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _format_job(job: Job, bullet: str) -> str:
+    """Format one job as its summary entry (title line, URL line, blank line)."""
+    location = f" | {job.location}" if job.location else ""
+    category = f" | {job.category}" if job.category else ""
+    return f"  {bullet} {job.title}{category}{location}\n    {job.url}\n"
+
+
+def _group_by_host(companies: list[Company]) -> list[list[Company]]:
+    """
+    Group companies into slices that share a careers-site hostname.
+    
+    Each slice is fetched sequentially by a single worker so that one
+    host is never hit by more than one request at a time.
+    """
+    slices: dict[str, list[Company]] = defaultdict(list)
+    for company in companies:
+        slices[urlparse(company.careers_url).netloc].append(company)
+    return list(slices.values())
+
+
+def _fetch_slice(companies: list[Company], entry_level_only: bool) -> list[FetchResult]:
+    """
+    Fetch jobs for a slice of companies hosted on the same domain.
+    
+    Runs in a worker thread, so it must not touch the database.
+    """
+    results: list[FetchResult] = []
+    for company in companies:
+        try:
+            scraper = create_scraper(company.careers_url)
+            
+            if entry_level_only:
+                jobs = scraper.fetch_entry_level_jobs()
+            else:
+                jobs = scraper.fetch_jobs()
+            
+            results.append((company, jobs, None))
+        except Exception as e:
+            results.append((company, [], e))
+    return results
+
+
+def _save_company_jobs(job_repo: JobRepository, company: Company, jobs: list[Job]) -> int:
+    """
+    Persist a company's fetched jobs.
+    
+    Returns:
+        Number of jobs that were newly inserted
+    """
+    if company.id is None:
+        return 0
+    
+    # Big batches (e.g. a company's first crawl) load faster through COPY
+    if len(jobs) > get_config().copy_threshold:
+        results = job_repo.upsert_many_copy(jobs, company.id)
+    else:
+        results = job_repo.upsert_many(jobs, company.id)
+    return sum(1 for _, is_new in results if is_new)
+
+
+def _fold_results(
+    results: list[FetchResult],
+    job_repo: JobRepository,
+    save_to_db: bool,
+    verbose: bool,
+    crawled_ids: list[int],
+) -> tuple[list[Job], int]:
+    """
+    Save and report fetched results, one company at a time.
+    
+    IDs of companies whose jobs were saved are appended to crawled_ids so
+    their last_crawled_at can be updated in a single statement afterwards.
+    
+    Returns:
+        Tuple of (jobs, new_job_count) for the successfully handled companies
+    """
+    folded_jobs: list[Job] = []
+    folded_new = 0
+    
+    for company, jobs, error in results:
+        if error is not None:
+            print(f"ERROR: Failed to fetch jobs from {company.name}: {error}", file=sys.stderr)
+            continue
+        
+        # Paginated listings can repeat a posting; keep one job per external_id
+        unique_jobs = list({job.external_id: job for job in jobs}.values())
+        if verbose and len(unique_jobs) < len(jobs):
+            print(f"  Skipped {len(jobs) - len(unique_jobs)} duplicate job(s) from {company.name}")
+        jobs = unique_jobs
+        
+        try:
+            new_count = 0
+            if save_to_db:
+                new_count = _save_company_jobs(job_repo, company, jobs)
+                if company.id is not None:
+                    crawled_ids.append(company.id)
+            
+            folded_jobs.extend(jobs)
+            folded_new += new_count
+            
+            if verbose:
+                print_job_summary(jobs, company.name, new_count)
+                
+        except Exception as e:
+            print(f"ERROR: Failed to save jobs from {company.name}: {e}", file=sys.stderr)
+    
+    return folded_jobs, folded_new
 
 
 def run_crawler(
@@ -68,6 +188,7 @@ def run_crawler(
     """
     all_jobs: list[Job] = []
     total_new = 0
+    crawled_ids: list[int] = []
     
     with Database() as db:
         company_repo = CompanyRepository(db)
@@ -80,40 +201,124 @@ def run_crawler(
                 print("  No active companies to crawl. Add companies to the database first.")
             return [], 0
         
-        for company in companies:
-            if verbose:
-                print(f"\nFetching jobs from {company.name}...")
+        slices = _group_by_host(companies)
+        max_workers = max(1, min(get_config().max_concurrent_fetches, len(slices)))
+        
+        if verbose:
+            print(f"\nFetching jobs from {len(companies)} company(ies) "
+                  f"across {len(slices)} host(s)...")
+        
+        # Fetch in parallel; database writes stay on this thread since
+        # psycopg2 connections are not safe to share across threads.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_fetch_slice, companies_slice, entry_level_only)
+                for companies_slice in slices
+            ]
             
-            try:
-                scraper = create_scraper(company.careers_url)
-                
-                if entry_level_only:
-                    jobs = scraper.fetch_entry_level_jobs()
-                else:
-                    jobs = scraper.fetch_jobs()
-                
-                new_count = 0
-                if save_to_db and company.id is not None:
-                    for job in jobs:
-                        _, is_new = job_repo.upsert(job, company.id)
-                        if is_new:
-                            new_count += 1
-                    
-                    # Update last_crawled_at
-                    company_repo.update_last_crawled(company.id)
-                
+            for future in as_completed(futures):
+                jobs, new_count = _fold_results(
+                    future.result(), job_repo, save_to_db, verbose, crawled_ids
+                )
                 all_jobs.extend(jobs)
                 total_new += new_count
-                
-                if verbose:
-                    print_job_summary(jobs, company.name, new_count)
-                    
-            except Exception as e:
-                print(f"ERROR: Failed to fetch jobs from {company.name}: {e}", file=sys.stderr)
+        
+        company_repo.update_last_crawled_many(crawled_ids)
     
     return all_jobs, total_new
 
 
+async def _fetch_company_async(
+    company: Company,
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    host_locks: dict[str, asyncio.Lock],
+    entry_level_only: bool,
+) -> FetchResult:
+    """Fetch one company's jobs, bounded globally and serialized per host."""
+    host = urlparse(company.careers_url).netloc
+    host_lock = host_locks.setdefault(host, asyncio.Lock())
+    
+    try:
+        scraper = create_scraper(company.careers_url)
+        async with host_lock, semaphore:
+            jobs = await scraper.fetch_jobs_async(client)
+        
+        if entry_level_only:
+            jobs = [job for job in jobs if job.is_entry_level]
+        
+        return company, jobs, None
+    except Exception as e:
+        return company, [], e
+
+
+async def _fetch_all_async(companies: list[Company], entry_level_only: bool) -> list[FetchResult]:
+    """Fetch all companies concurrently on a single event loop."""
+    semaphore = asyncio.Semaphore(get_config().max_concurrent_fetches)
+    host_locks: dict[str, asyncio.Lock] = {}
+    
+    # HTTP/2 lets requests to the same careers host share one connection;
+    # the transport retries failed connects like the sync client's does
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_connections=50),
+        retries=RETRY_ATTEMPTS,
+    )
+    async with httpx.AsyncClient(
+        transport=transport,
+        headers=DEFAULT_HEADERS,
+        timeout=httpx.Timeout(REQUEST_TIMEOUT_SECONDS),
+    ) as client:
+        return await asyncio.gather(*[
+            _fetch_company_async(company, client, semaphore, host_locks, entry_level_only)
+            for company in companies
+        ])
+
+
+def run_crawler_async(
+    entry_level_only: bool = False,
+    save_to_db: bool = True,
+    verbose: bool = True,
+) -> tuple[list[Job], int]:
+    """
+    Run the job crawler for all active companies using asyncio.
+    
+    All careers sites are fetched concurrently from one event loop
+    (bounded by MAX_CONCURRENT_FETCHES, one request per host at a time,
+    spaced by each host's rate limit and retried like the sync crawl),
+    then results are saved to the database sequentially.
+    
+    Args:
+        entry_level_only: If True, only return entry-level jobs
+        save_to_db: If True, save jobs to database (default True)
+        verbose: If True, print progress to console
+        
+    Returns:
+        Tuple of (all_jobs, new_job_count)
+    """
+    with Database() as db:
+        company_repo = CompanyRepository(db)
+        job_repo = JobRepository(db)
+        
+        companies = company_repo.get_all_active()
+        
+        if not companies:
+            if verbose:
+                print("  No active companies to crawl. Add companies to the database first.")
+            return [], 0
+        
+        if verbose:
+            print(f"\nFetching jobs from {len(companies)} company(ies)...")
+        
+        results = asyncio.run(_fetch_all_async(companies, entry_level_only))
+        
+        crawled_ids: list[int] = []
+        folded = _fold_results(results, job_repo, save_to_db, verbose, crawled_ids)
+        company_repo.update_last_crawled_many(crawled_ids)
+        
+        return folded
+
+
 def run_crawler_for_url(
     url: str,
     entry_level_only: bool = False,
@@ -171,6 +376,12 @@ def main() -> int:
         action="store_true",
         help="Don't save jobs to database (dry run)",
     )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Fetch all companies concurrently with asyncio",
+    )
     parser.add_argument(
         "--quiet",
         action="store_true",
@@ -193,22 +404,26 @@ def main() -> int:
         new_count = 0
     else:
         # Database mode
-        jobs, new_count = run_crawler(
+        crawl = run_crawler_async if args.use_async else run_crawler
+        jobs, new_count = crawl(
             entry_level_only=args.entry_level_only,
             save_to_db=not args.no_save,
             verbose=not args.quiet,
         )
     
-    # Summary
+    # Summary, written to stdout in one call like print_job_summary
     entry_level_count = sum(1 for j in jobs if j.is_entry_level)
-    print(f"\n{'='*60}")
-    print(f"  SUMMARY")
-    print(f"{'='*60}")
-    print(f"  Total jobs found: {len(jobs)}")
-    print(f"  Entry-level jobs: {entry_level_count}")
+    lines = [
+        f"\n{'='*60}",
+        "  SUMMARY",
+        f"{'='*60}",
+        f"  Total jobs found: {len(jobs)}",
+        f"  Entry-level jobs: {entry_level_count}",
+    ]
     if not args.url:
-        print(f"  New jobs added:   {new_count}")
-    print(f"{'='*60}\n")
+        lines.append(f"  New jobs added:   {new_count}")
+    lines.append(f"{'='*60}\n")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     return 0
 
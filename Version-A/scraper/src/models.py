@@ -4,12 +4,12 @@ Job Crawler - Data Models
 Defines the core data structures for jobs and companies.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import MISSING, dataclass, field, fields
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional, Sequence
 
 
-@dataclass
+@dataclass(slots=True)
 class Company:
     """Represents a company being tracked."""
     
@@ -21,9 +21,15 @@ class Company:
     last_crawled_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Job:
-    """Represents a job posting."""
+    """
+    Represents a job posting.
+    
+    Immutable: scrapers hand the same Job objects to several callers
+    (e.g. from their revalidation cache). Use dataclasses.replace to
+    derive a changed copy.
+    """
     
     title: str
     url: str
@@ -39,3 +45,35 @@ class Job:
     def __str__(self) -> str:
         location_str = f" ({self.location})" if self.location else ""
         return f"{self.title} at {self.company_name}{location_str}"
+    
+    @classmethod
+    def from_db_row(cls, row: Sequence[Any]) -> "Job":
+        """
+        Build a Job from a tuple row, bypassing __init__.
+        
+        The row holds the JOB_ROW_COLUMNS values, in that order. Rows come
+        from our own schema, so values are assigned as-is; fields not in
+        JOB_ROW_COLUMNS get their default (or None).
+        """
+        job = object.__new__(cls)
+        # object.__setattr__ gets past the frozen guard on the new instance
+        set_field = object.__setattr__
+        for name, value in zip(JOB_ROW_COLUMNS, row):
+            set_field(job, name, value)
+        for name, default in _JOB_ROW_DEFAULTS.items():
+            set_field(job, name, default)
+        return job
+
+
+# Columns of a row passed to Job.from_db_row, in order
+JOB_ROW_COLUMNS: tuple[str, ...] = (
+    "title", "url", "external_id", "company_name",
+    "category", "location", "employment_type",
+    "is_entry_level", "first_seen_at",
+)
+
+# Field name -> default for the Job fields a row does not hold
+_JOB_ROW_DEFAULTS: dict[str, Any] = {
+    f.name: (None if f.default is MISSING else f.default)
+    for f in fields(Job) if f.name not in JOB_ROW_COLUMNS
+}
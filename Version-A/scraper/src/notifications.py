@@ -5,14 +5,17 @@ Handles email notifications using Gmail API or SMTP.
 """
 
 import base64
+import functools
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from typing import Optional, Protocol
+from email.message import EmailMessage
+from typing import Iterable, Optional, Protocol
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+import httplib2
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build, Resource
@@ -21,23 +24,73 @@ from .models import Job
 from .config import get_config
 
 
+# Shared by every backend instance; compiled templates are cached on it.
+# The bytecode cache (in a per-user temp directory) also lets separate
+# digest runs skip template compilation; templates only change on deploy.
+_jinja_env = Environment(
+    loader=FileSystemLoader(os.path.join(os.path.dirname(__file__), 'templates')),
+    autoescape=select_autoescape(['html', 'xml']),
+    bytecode_cache=FileSystemBytecodeCache(pattern='jobcrawler-%s.cache'),
+    auto_reload=False
+)
+
+
 class EmailBackend(Protocol):
-    """Protocol for email backends."""
-    def send_digest(self, to_email: str, jobs: list[Job]) -> None:
+    """
+    Protocol for email backends.
+    
+    Jobs may be a one-shot iterator (entry-level jobs first), so backends
+    take the counts separately instead of calling len() on it.
+    """
+    def send_digest(
+        self,
+        to_email: str,
+        jobs: Iterable[Job],
+        total_count: int,
+        entry_level_count: int,
+    ) -> None:
+        ...
+
+    def send_digest_many(
+        self,
+        to_emails: Iterable[str],
+        jobs: Iterable[Job],
+        total_count: int,
+        entry_level_count: int,
+    ) -> None:
         ...
 
 
 class ConsoleBackend:
     """Backend that prints email to console (for dev/testing)."""
     
-    def send_digest(self, to_email: str, jobs: list[Job]) -> None:
+    def send_digest(
+        self,
+        to_email: str,
+        jobs: Iterable[Job],
+        total_count: int,
+        entry_level_count: int,
+    ) -> None:
+        if not total_count:
+            return
+        
         print(f"\n{'='*60}")
         print(f"  [MOCK EMAIL] To: {to_email}")
-        print(f"  Subject: Job Crawler Digest - {len(jobs)} new jobs")
+        print(f"  Subject: Job Crawler Digest - {total_count} new jobs")
         print(f"{'='*60}")
-        print(f"  (Email content would go here - {len(jobs)} jobs found)")
+        print(f"  (Email content would go here - {total_count} jobs found)")
         print(f"{'='*60}\n")
 
+    def send_digest_many(
+        self,
+        to_emails: Iterable[str],
+        jobs: Iterable[Job],
+        total_count: int,
+        entry_level_count: int,
+    ) -> None:
+        for to_email in to_emails:
+            self.send_digest(to_email, jobs, total_count, entry_level_count)
+
 
 class GmailAPIBackend:
     """Backend that sends emails via Gmail API."""
@@ -50,12 +103,8 @@ class GmailAPIBackend:
         self.credentials_path = credentials_path
         self._service: Optional[Resource] = None
         
-        # Load template
-        template_dir = os.path.join(os.path.dirname(__file__), 'templates')
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(template_dir),
-            autoescape=select_autoescape(['html', 'xml'])
-        )
+        # Compiled once here, rendered on every send
+        self._template = _jinja_env.get_template('digest.html')
 
     def _get_service(self) -> Resource:
         """Authenticate and return Gmail service."""
@@ -83,47 +132,140 @@ class GmailAPIBackend:
         self._service = build('gmail', 'v1', credentials=self.creds)
         return self._service
 
-    def send_digest(self, to_email: str, jobs: list[Job]) -> None:
-        """Send daily digest email."""
-        if not jobs:
+    def send_digest(
+        self,
+        to_email: str,
+        jobs: Iterable[Job],
+        total_count: int,
+        entry_level_count: int,
+    ) -> None:
+        """
+        Send daily digest email.
+        
+        Args:
+            to_email: Recipient email address
+            jobs: Jobs to include, entry-level jobs first
+            total_count: Number of jobs in `jobs`
+            entry_level_count: Number of entry-level jobs in `jobs`
+        """
+        if not total_count:
+            return
+
+        self._get_service()
+        message = self._build_message(jobs, total_count, entry_level_count)
+        try:
+            self._send_one(to_email, message)
+        except Exception as e:
+            print(f"Failed to send email to {to_email}: {e}")
+
+    def send_digest_many(
+        self,
+        to_emails: Iterable[str],
+        jobs: Iterable[Job],
+        total_count: int,
+        entry_level_count: int,
+    ) -> None:
+        """
+        Send the same daily digest to several recipients.
+        
+        The digest is rendered and serialized once; the sends run
+        concurrently so their API round trips overlap.
+        
+        Args:
+            to_emails: Recipient email addresses
+            jobs: Jobs to include, entry-level jobs first
+            total_count: Number of jobs in `jobs`
+            entry_level_count: Number of entry-level jobs in `jobs`
+        """
+        if not total_count:
             return
 
-        service = self._get_service()
+        # Authenticate up front; the OAuth flow must not run in a worker
+        self._get_service()
+        message = self._build_message(jobs, total_count, entry_level_count)
         
-        # Prepare data
-        entry_level = [j for j in jobs if j.is_entry_level]
-        other = [j for j in jobs if not j.is_entry_level]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                to_email: executor.submit(self._send_one, to_email, message)
+                for to_email in to_emails
+            }
         
-        template = self.jinja_env.get_template('digest.html')
-        html_content = template.render(
+        for to_email, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Failed to send email to {to_email}: {e}")
+
+    def _build_message(
+        self,
+        jobs: Iterable[Job],
+        total_count: int,
+        entry_level_count: int,
+    ) -> bytes:
+        """
+        Render the digest into a serialized message with no To header.
+        
+        Args:
+            jobs: Jobs to include, entry-level jobs first
+            total_count: Number of jobs in `jobs`
+            entry_level_count: Number of entry-level jobs in `jobs`
+            
+        Returns:
+            The message bytes, ready for `_send_one`
+        """
+        # Render chunk by chunk so jobs are consumed one at a time
+        # rather than collected into lists first
+        html_content = "".join(self._template.generate(
             date=datetime.now().strftime('%B %d, %Y'),
-            total_count=len(jobs),
-            entry_level_count=len(entry_level),
-            entry_level_jobs=entry_level,
-            other_jobs=other,
+            total_count=total_count,
+            entry_level_count=entry_level_count,
+            jobs=jobs,
             dashboard_url=os.getenv("DASHBOARD_URL", "http://localhost:3000")
-        )
+        ))
 
-        # Create message
-        message = MIMEMultipart()
-        message['to'] = to_email
-        message['subject'] = f"Job Crawler Digest: {len(jobs)} new jobs found"
-        message.attach(MIMEText(html_content, 'html'))
+        # Create message (a single HTML part, no multipart wrapper)
+        message = EmailMessage()
+        message['Subject'] = f"Job Crawler Digest: {total_count} new jobs found"
+        message.set_content(html_content, subtype='html')
         
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
+        return bytes(message)
+
+    def _send_one(self, to_email: str, message: bytes) -> None:
+        """
+        Address a message built by `_build_message` and send it.
         
-        try:
-            service.users().messages().send(
-                userId='me', 
-                body={'raw': raw_message}
-            ).execute()
-            print(f"Email sent to {to_email}")
-        except Exception as e:
-            print(f"Failed to send email: {e}")
+        Safe to call from several threads: httplib2 connections are not
+        thread-safe, so each call sends over its own authorized connection.
+        
+        Args:
+            to_email: Recipient email address
+            message: Serialized message without a To header
+            
+        Raises:
+            Exception: Whatever the Gmail API client raised; callers report it
+        """
+        # Prepending the header avoids re-serializing the message per recipient
+        to_header = EmailMessage()
+        to_header['To'] = to_email
+        raw_message = base64.urlsafe_b64encode(
+            bytes(to_header).rstrip(b'\n') + b'\n' + message
+        ).decode('ascii')
+        
+        self._get_service().users().messages().send(
+            userId='me', 
+            body={'raw': raw_message}
+        ).execute(http=AuthorizedHttp(self.creds, http=httplib2.Http()))
+        print(f"Email sent to {to_email}")
 
 
+@functools.lru_cache(maxsize=1)
 def get_notification_service() -> EmailBackend:
-    """Factory to get the configured notification backend."""
+    """
+    Factory to get the configured notification backend.
+    
+    The backend is built once per process, so the Gmail service and
+    its credentials are reused across sends.
+    """
     # Check if we have Gmail credentials
     if os.path.exists('credentials.json') or os.path.exists('token.json'):
         return GmailAPIBackend()
@@ -5,18 +5,152 @@ Fetches job listings from BambooHR-hosted career pages.
 BambooHR provides a JSON API at /careers/list which makes scraping reliable.
 """
 
+import asyncio
+import functools
+import threading
 import time
 import re
 from typing import Optional
-from urllib.parse import urlparse
 
-import requests
+import httpx
+import orjson
 
 from .models import Job
 
 
-# Keywords that indicate entry-level / new grad positions
-ENTRY_LEVEL_KEYWORDS = [
+# Timeout for a single HTTP request to a careers site (seconds)
+REQUEST_TIMEOUT_SECONDS = 30
+
+# Headers sent with every request to a careers site
+DEFAULT_HEADERS = {
+    "User-Agent": "JobCrawler/1.0 (Educational Project)",
+    "Accept": "application/json",
+}
+
+
+# Keep-alive connections kept open across all careers hosts
+CLIENT_POOL_SIZE = 32
+
+# Statuses worth retrying, and attempts / backoff for them (see BambooHRScraper._fetch
+# and fetch_jobs_async)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF_SECONDS = 0.5
+
+# Client shared by every scraper and crawler thread (see get_client)
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> httpx.Client:
+    """
+    Get the HTTP client shared by all scrapers, creating it on first use.
+    
+    Sharing one client lets every scraper (and every crawler worker
+    thread) reuse the same pool of keep-alive connections instead of
+    opening new ones per company. With HTTP/2, concurrent requests to
+    one host are multiplexed over a single connection.
+    
+    Returns:
+        httpx.Client configured with DEFAULT_HEADERS, HTTP/2, a pool of
+        CLIENT_POOL_SIZE keep-alive connections and connect retries
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            transport = httpx.HTTPTransport(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=CLIENT_POOL_SIZE * 2,
+                    max_keepalive_connections=CLIENT_POOL_SIZE,
+                ),
+                retries=RETRY_ATTEMPTS,
+            )
+            _client = httpx.Client(
+                transport=transport,
+                headers=DEFAULT_HEADERS,
+                timeout=httpx.Timeout(REQUEST_TIMEOUT_SECONDS),
+                follow_redirects=True,
+            )
+        return _client
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter, safe to share across threads.
+    
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    A caller that finds the bucket short reserves its tokens anyway
+    (the balance goes negative) and sleeps off only its own deficit,
+    outside the lock, so waiters queue up fairly.
+    """
+    
+    __slots__ = ("rate", "capacity", "tokens", "last_ns", "lock")
+    
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (the allowed burst)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_ns = time.monotonic_ns()
+        self.lock = threading.Lock()
+    
+    def acquire(self, cost: float = 1.0) -> None:
+        """Take `cost` tokens, sleeping until they are available."""
+        wait = self._reserve(cost)
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def acquire_async(self, cost: float = 1.0) -> None:
+        """Take `cost` tokens, awaiting (not blocking the loop) until they are available."""
+        wait = self._reserve(cost)
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    def _reserve(self, cost: float) -> float:
+        """Reserve `cost` tokens and return the seconds to wait for them."""
+        with self.lock:
+            now = time.monotonic_ns()
+            refill = (now - self.last_ns) * self.rate / 1e9
+            self.tokens = min(self.capacity, self.tokens + refill) - cost
+            self.last_ns = now
+            deficit = -self.tokens
+        return deficit / self.rate if deficit > 0 else 0.0
+
+
+# Rate limiters shared by every scraper, keyed by careers host (see get_bucket)
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(host: str, rate_limit_seconds: float) -> TokenBucket:
+    """
+    Get the rate limiter for a careers host, creating it on first use.
+    
+    The first scraper for a host fixes its rate; scrapers for the same
+    host then share one limit instead of each keeping their own.
+    
+    Args:
+        host: Host name, e.g. d1g1t.bamboohr.com
+        rate_limit_seconds: Minimum seconds between requests to the host
+        
+    Returns:
+        TokenBucket allowing one request per `rate_limit_seconds`
+    """
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            bucket = _buckets[host] = TokenBucket(rate=1.0 / rate_limit_seconds)
+        return bucket
+
+
+# Keywords that indicate entry-level / new grad positions (lowercase).
+# Frozen so the derived _ENTRY_KEYWORDS below can never drift from it.
+ENTRY_LEVEL_KEYWORDS = frozenset([
     "new grad",
     "new graduate",
     "entry level",
@@ -37,7 +171,48 @@ ENTRY_LEVEL_KEYWORDS = [
     "0-3 years",
     "1-2 years",
     "1-3 years",
-]
+])
+
+# Keywords actually scanned for: one that contains a shorter keyword
+# (e.g. "internship" contains "intern") can never change the result
+_ENTRY_KEYWORDS = tuple(sorted(
+    keyword for keyword in ENTRY_LEVEL_KEYWORDS
+    if not any(other != keyword and other in keyword for other in ENTRY_LEVEL_KEYWORDS)
+))
+
+
+# Seniority markers that rule a title out before the keyword scan, so e.g.
+# "Senior Associate" is not taken for entry-level. Matched as whole words
+# ("staffing" or "leadership" do not count); phrases are matched as is.
+_SENIOR_WORDS = frozenset({"senior", "sr", "staff", "principal", "director", "lead", "vp"})
+_SENIOR_PHRASES = ("head of", "vice president")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_entry_level_text(job_title: str, department: str) -> bool:
+    """
+    Classify a title/department pair (see BambooHRScraper._is_entry_level).
+    
+    Cached because the same titles come back on every crawl.
+    """
+    title = job_title.lower()
+    if not _SENIOR_WORDS.isdisjoint(_WORD_RE.findall(title)):
+        return False
+    for phrase in _SENIOR_PHRASES:
+        if phrase in title:
+            return False
+    
+    # One lowered str scanned per keyword is the fastest option measured:
+    # a combined IGNORECASE regex, or bytes needles on encoded text, were
+    # several times slower on real titles
+    text_to_check = f"{title} {department.lower()}"
+    
+    for keyword in _ENTRY_KEYWORDS:
+        if keyword in text_to_check:
+            return True
+    
+    return False
 
 
 class BambooHRScraper:
@@ -49,6 +224,20 @@ class BambooHRScraper:
     - Job detail page: https://{company}.bamboohr.com/careers/{job_id}
     """
     
+    __slots__ = (
+        "careers_url",
+        "rate_limit_seconds",
+        "_bucket",
+        "company_subdomain",
+        "api_url",
+        "_job_url_prefix",
+        "client",
+        "_etag",
+        "_last_modified",
+        "_cached_jobs",
+        "_cached_entry_only",
+    )
+    
     def __init__(self, careers_url: str, rate_limit_seconds: float = 1.0):
         """
         Initialize the scraper.
@@ -60,34 +249,46 @@ class BambooHRScraper:
         """
         self.careers_url = careers_url.rstrip("/")
         self.rate_limit_seconds = rate_limit_seconds
-        self.last_request_time: Optional[float] = None
         
         # Extract company subdomain for naming
-        parsed = urlparse(self.careers_url)
-        self.company_subdomain = parsed.netloc.split(".")[0]
+        # (the first label of the host, e.g. "d1g1t" for https://d1g1t.bamboohr.com)
+        host = self.careers_url.partition("://")[2].split("/", 1)[0]
+        self.company_subdomain = host.split(".", 1)[0]
         
-        # Build API endpoint
+        # Per-host limiter shared with any other scraper for the same host
+        self._bucket = get_bucket(host, rate_limit_seconds) if rate_limit_seconds > 0 else None
+        
+        # Build API endpoint, and the prefix every job posting URL shares
         self.api_url = f"{self.careers_url}/list"
+        self._job_url_prefix = f"{self.careers_url}/"
+        
+        # Shared client for connection pooling across scrapers
+        self.client = get_client()
         
-        # Session for connection pooling
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "JobCrawler/1.0 (Educational Project)",
-            "Accept": "application/json",
-        })
+        # Validators and jobs from the last full /careers/list response,
+        # so an unchanged listing comes back as a bodiless 304
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._cached_jobs: Optional[list[Job]] = None
+        self._cached_entry_only = False
     
     def _respect_rate_limit(self) -> None:
         """Wait if necessary to respect rate limiting."""
-        if self.last_request_time is not None:
-            elapsed = time.time() - self.last_request_time
-            if elapsed < self.rate_limit_seconds:
-                time.sleep(self.rate_limit_seconds - elapsed)
-        self.last_request_time = time.time()
+        if self._bucket is not None:
+            self._bucket.acquire()
+    
+    async def _respect_rate_limit_async(self) -> None:
+        """Await if necessary to respect rate limiting (see _respect_rate_limit)."""
+        if self._bucket is not None:
+            await self._bucket.acquire_async()
     
     def _is_entry_level(self, job_title: str, department: str = "") -> bool:
         """
         Check if a job appears to be entry-level based on title and department.
         
+        Titles with a seniority marker (senior, staff, lead, ...) are never
+        entry-level, whatever else they contain.
+        
         Args:
             job_title: The job title
             department: The department name (optional)
@@ -95,17 +296,11 @@ class BambooHRScraper:
         Returns:
             True if the job appears to be entry-level
         """
-        text_to_check = f"{job_title} {department}".lower()
-        
-        for keyword in ENTRY_LEVEL_KEYWORDS:
-            if keyword in text_to_check:
-                return True
-        
-        return False
+        return _is_entry_level_text(job_title or "", department or "")
     
     def _build_job_url(self, job_id: str) -> str:
         """Build the URL for a specific job posting."""
-        return f"{self.careers_url}/{job_id}"
+        return self._job_url_prefix + job_id
     
     def _build_location_string(self, job_data: dict) -> Optional[str]:
         """
@@ -118,36 +313,23 @@ class BambooHRScraper:
             Location string or None if no location data
         """
         # Try atsLocation first (more detailed)
-        ats_loc = job_data.get("atsLocation", {})
-        if ats_loc:
-            parts = []
-            if ats_loc.get("city"):
-                parts.append(ats_loc["city"])
-            if ats_loc.get("state"):
-                parts.append(ats_loc["state"])
-            elif ats_loc.get("province"):
-                parts.append(ats_loc["province"])
-            if ats_loc.get("country"):
-                parts.append(ats_loc["country"])
-            if parts:
-                return ", ".join(parts)
+        ats_loc = job_data.get("atsLocation") or {}
+        location = ", ".join(filter(None, (
+            ats_loc.get("city"),
+            ats_loc.get("state") or ats_loc.get("province"),
+            ats_loc.get("country"),
+        )))
+        if location:
+            return location
         
         # Fall back to basic location
-        loc = job_data.get("location", {})
-        if loc:
-            parts = []
-            if loc.get("city"):
-                parts.append(loc["city"])
-            if loc.get("state"):
-                parts.append(loc["state"])
-            if parts:
-                return ", ".join(parts)
+        loc = job_data.get("location") or {}
+        location = ", ".join(filter(None, (loc.get("city"), loc.get("state"))))
+        if location:
+            return location
         
         # Check if remote
-        if job_data.get("isRemote"):
-            return "Remote"
-        
-        return None
+        return "Remote" if job_data.get("isRemote") else None
     
     def fetch_jobs(self) -> list[Job]:
         """
@@ -157,48 +339,158 @@ class BambooHRScraper:
             List of Job objects
             
         Raises:
-            requests.RequestException: If the request fails
+            httpx.HTTPError: If the request fails
+        """
+        return self._fetch(entry_only=False)
+    
+    def fetch_entry_level_jobs(self) -> list[Job]:
         """
-        self._respect_rate_limit()
+        Fetch only entry-level job listings.
         
-        response = self.session.get(self.api_url, timeout=30)
-        response.raise_for_status()
+        Other listings are skipped while parsing, so no Job is built for them.
+        
+        Returns:
+            List of Job objects that appear to be entry-level
+            
+        Raises:
+            httpx.HTTPError: If the request fails
+        """
+        return self._fetch(entry_only=True)
+    
+    async def fetch_jobs_async(self, client: httpx.AsyncClient) -> list[Job]:
+        """
+        Fetch all job listings using a shared httpx client.
         
-        data = response.json()
-        jobs: list[Job] = []
+        The async counterpart of fetch_jobs: requests are spaced by the
+        host's shared rate limiter, and 429 and 5xx responses are retried
+        with the same backoff as _fetch. Connection failures are left to
+        the client's transport (see main._fetch_all_async).
         
-        for job_data in data.get("result", []):
-            job_id = str(job_data.get("id", ""))
-            title = job_data.get("jobOpeningName", "Unknown Title")
-            department = job_data.get("departmentLabel", "")
-            employment_type = job_data.get("employmentStatusLabel")
-            location = self._build_location_string(job_data)
+        Args:
+            client: The HTTP/2 client to issue the request on
+                    (expected to send DEFAULT_HEADERS)
             
-            job = Job(
-                title=title,
-                url=self._build_job_url(job_id),
-                external_id=job_id,
-                company_name=self.company_subdomain,
-                category=department if department else None,
-                location=location,
-                employment_type=employment_type,
-                is_entry_level=self._is_entry_level(title, department),
-            )
-            jobs.append(job)
+        Returns:
+            List of Job objects
+            
+        Raises:
+            httpx.HTTPError: If the request fails
+        """
+        headers = self._conditional_headers(False)
+        for attempt in range(RETRY_ATTEMPTS + 1):
+            await self._respect_rate_limit_async()
+            response = await client.get(self.api_url, headers=headers)
+            if response.status_code not in RETRY_STATUSES or attempt == RETRY_ATTEMPTS:
+                break
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
         
-        return jobs
+        if response.status_code == 304 and self._cached_jobs is not None:
+            return self._from_cache(False)
+        response.raise_for_status()
+        
+        return self._cache_jobs(response.headers, orjson.loads(response.content), False)
     
-    def fetch_entry_level_jobs(self) -> list[Job]:
+    def _fetch(self, entry_only: bool) -> list[Job]:
         """
-        Fetch only entry-level job listings.
+        Fetch the listing over the shared client (see fetch_jobs).
+        
+        Connection failures are retried by the transport; 429 and 5xx
+        responses are retried here with exponential backoff, and the last
+        response is returned as is if they persist.
+        """
+        headers = self._conditional_headers(entry_only)
+        for attempt in range(RETRY_ATTEMPTS + 1):
+            self._respect_rate_limit()
+            response = self.client.get(self.api_url, headers=headers)
+            if response.status_code not in RETRY_STATUSES or attempt == RETRY_ATTEMPTS:
+                break
+            time.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
+        
+        if response.status_code == 304 and self._cached_jobs is not None:
+            return self._from_cache(entry_only)
+        response.raise_for_status()
+        
+        return self._cache_jobs(response.headers, orjson.loads(response.content), entry_only)
+    
+    def _conditional_headers(self, entry_only: bool) -> dict[str, str]:
+        """
+        Build If-None-Match / If-Modified-Since headers from the last response.
         
+        None are sent unless the cached jobs cover the request: an
+        entry-level-only cache cannot answer a request for all jobs.
+        """
+        headers: dict[str, str] = {}
+        if self._cached_jobs is None or (self._cached_entry_only and not entry_only):
+            return headers
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        return headers
+    
+    def _from_cache(self, entry_only: bool) -> list[Job]:
+        """Return a copy of the cached jobs after a 304, filtered if needed."""
+        if entry_only and not self._cached_entry_only:
+            return [job for job in self._cached_jobs if job.is_entry_level]
+        return list(self._cached_jobs)
+    
+    def _cache_jobs(self, response_headers, data: dict, entry_only: bool) -> list[Job]:
+        """
+        Parse a /careers/list response and remember it for revalidation.
+        
+        Args:
+            response_headers: Headers of the response
+            data: Decoded JSON response from the API
+            entry_only: Only build entry-level jobs
+            
         Returns:
-            List of Job objects that appear to be entry-level
+            List of Job objects
         """
-        all_jobs = self.fetch_jobs()
-        return [job for job in all_jobs if job.is_entry_level]
+        # A comprehension over _build_job, rather than a generator or an
+        # append loop, keeps the per-job overhead to the call itself
+        build_job = self._build_job
+        jobs = [
+            job for job_data in data.get("result", [])
+            if (job := build_job(job_data, entry_only)) is not None
+        ]
+        self._etag = response_headers.get("ETag")
+        self._last_modified = response_headers.get("Last-Modified")
+        self._cached_jobs = jobs
+        self._cached_entry_only = entry_only
+        return list(jobs)
+    
+    def _build_job(self, job_data: dict, entry_only: bool = False) -> Optional[Job]:
+        """
+        Build a Job from one item of the /careers/list `result` array.
+        
+        Args:
+            job_data: Raw job data from the API
+            entry_only: Return None for jobs that are not entry-level,
+                        before anything else is built for them
+            
+        Returns:
+            The Job, or None if it was skipped
+        """
+        title = job_data.get("jobOpeningName", "Unknown Title")
+        department = job_data.get("departmentLabel", "")
+        is_entry = self._is_entry_level(title, department)
+        if entry_only and not is_entry:
+            return None
+        
+        job_id = str(job_data.get("id", ""))
+        return Job(
+            title=title,
+            url=self._build_job_url(job_id),
+            external_id=job_id,
+            company_name=self.company_subdomain,
+            category=department if department else None,
+            location=self._build_location_string(job_data),
+            employment_type=job_data.get("employmentStatusLabel"),
+            is_entry_level=is_entry,
+        )
 
 
+@functools.lru_cache(maxsize=256)
 def create_scraper(careers_url: str) -> BambooHRScraper:
     """
     Factory function to create the appropriate scraper for a careers URL.
@@ -206,6 +498,9 @@ def create_scraper(careers_url: str) -> BambooHRScraper:
     Currently only supports BambooHR. Future versions will detect
     the platform and return the appropriate scraper.
     
+    Scrapers are cached per URL, so repeated crawls in one process reuse
+    them along with their ETag caches.
+    
     Args:
         careers_url: The company's careers page URL
         
@@ -1,73 +1,165 @@
 """
 Job Crawler - Scraper Server
 
-A lightweight HTTP server to listen for crawl triggers from the web UI.
+A lightweight HTTP server to listen for crawl triggers from the web UI
+and serve the stored jobs as JSON.
 """
 
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import json
 import sys
 from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
 
-from .main import run_crawler
+import psycopg2
 
-# Global lock to prevent concurrent crawls
-CRAWL_LOCK = threading.Lock()
+from .database import Database, JobRepository
+from .main import run_crawler_async
+
+# Crawl state: one long-lived worker thread (see _crawl_worker) runs a
+# crawl each time the trigger is set. The state lock only guards the
+# idle -> running check-and-set, so a second trigger can never slip in
+# between the check and the start.
+_STATE_LOCK = threading.Lock()
+_CRAWL_STATE = {"running": False}
+_CRAWL_TRIGGER = threading.Event()
+
+# Response bodies never change, so they are encoded once here
+_ACCEPTED_BODY = json.dumps({
+    'status': 'accepted',
+    'message': 'Crawl started'
+}).encode()
+_BUSY_BODY = json.dumps({
+    'status': 'error',
+    'message': 'Crawl already in progress'
+}).encode()
+_HEALTH_BODY = b"OK"
+_DB_UNAVAILABLE_BODY = json.dumps({
+    'status': 'error',
+    'message': 'Database unavailable'
+}).encode()
+_BAD_LENGTH_BODY = json.dumps({
+    'status': 'error',
+    'message': 'Invalid Content-Length'
+}).encode()
+_BAD_QUERY_BODY = json.dumps({
+    'status': 'error',
+    'message': 'Invalid query parameters'
+}).encode()
 
 class CrawlerRequestHandler(BaseHTTPRequestHandler):
+    # Keep connections open between requests (e.g. repeated health probes);
+    # every response therefore carries a Content-Length
+    protocol_version = "HTTP/1.1"
+
+    # Buffer the response stream: status line, headers and body collect in
+    # wfile and go out in one write when the request is done (the base
+    # handler flushes wfile after every request)
+    wbufsize = -1
+
+    def _send_body(self, status, body=b"", content_type=None):
+        """Send a complete response with its Content-Length."""
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
     def do_POST(self):
+        # Drain any request body so the next request on the connection parses
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            # The body cannot be skipped, so the connection cannot be reused
+            self.close_connection = True
+            self._send_body(400, _BAD_LENGTH_BODY, 'application/json')  # Bad Request
+            return
+        if length:
+            self.rfile.read(length)
+
         if self.path == '/crawl':
-            if CRAWL_LOCK.locked():
-                self.send_response(409)  # Conflict
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({
-                    'status': 'error',
-                    'message': 'Crawl already in progress'
-                }).encode())
+            with _STATE_LOCK:
+                busy = _CRAWL_STATE["running"]
+                _CRAWL_STATE["running"] = True
+            if busy:
+                self._send_body(409, _BUSY_BODY, 'application/json')  # Conflict
                 return
 
-            # Start crawl in a separate thread to not block the response
-            thread = threading.Thread(target=self.run_background_crawl)
-            thread.start()
-
-            self.send_response(202)  # Accepted
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({
-                'status': 'accepted',
-                'message': 'Crawl started'
-            }).encode())
+            # Hand off to the crawl worker so the response is not blocked
+            _CRAWL_TRIGGER.set()
+            self._send_body(202, _ACCEPTED_BODY, 'application/json')  # Accepted
         else:
-            self.send_response(404)
-            self.end_headers()
-
-    def run_background_crawl(self):
-        """Run the crawler safely with a lock."""
-        with CRAWL_LOCK:
-            print(f"[{datetime.now()}] Triggered crawl starting...")
-            try:
-                # Reload config/DB connection if needed inside run_crawler
-                # We save to DB and print verbose output
-                run_crawler(save_to_db=True, verbose=True)
-                print(f"[{datetime.now()}] Triggered crawl finished successfully.")
-            except Exception as e:
-                print(f"[{datetime.now()}] Triggered crawl failed: {e}", file=sys.stderr)
+            self._send_body(404)
 
     def do_GET(self):
+        url = urlsplit(self.path)
+
         # Health check
-        if self.path == '/health':
-            self.send_response(200)
-            self.end_headers()
-            self.wfile.write(b"OK")
+        if url.path == '/health':
+            self._send_body(200, _HEALTH_BODY)
+        elif url.path == '/jobs':
+            self._send_jobs(parse_qs(url.query))
         else:
-            self.send_response(404)
-            self.end_headers()
+            self._send_body(404)
+
+    def _send_jobs(self, query):
+        """
+        Serve recent jobs as JSON, filtered like JobRepository.get_all.
+        
+        Query parameters: entry_level_only (true/false), company_id, limit.
+        """
+        try:
+            entry_level_only = query.get('entry_level_only', ['false'])[0].lower() in ('1', 'true')
+            company_id = query.get('company_id')
+            company_id = int(company_id[0]) if company_id else None
+            limit = int(query.get('limit', ['100'])[0])
+            if limit < 1:
+                raise ValueError(limit)
+        except ValueError:
+            self._send_body(400, _BAD_QUERY_BODY, 'application/json')  # Bad Request
+            return
+        
+        # The repository hands back the encoded body, so it is written as is
+        try:
+            with Database() as db:
+                body = JobRepository(db).get_all_json(
+                    entry_level_only=entry_level_only,
+                    company_id=company_id,
+                    limit=limit,
+                )
+        except psycopg2.Error as e:  # Includes PoolError when no connection frees up
+            print(f"[{datetime.now()}] /jobs failed: {e}", file=sys.stderr)
+            self._send_body(503, _DB_UNAVAILABLE_BODY, 'application/json')  # Service Unavailable
+            return
+        self._send_body(200, body, 'application/json')
+
+def _crawl_worker():
+    """Run a crawl each time one is triggered, then go back to idle."""
+    while True:
+        _CRAWL_TRIGGER.wait()
+        _CRAWL_TRIGGER.clear()
+        print(f"[{datetime.now()}] Triggered crawl starting...")
+        try:
+            # Fetches every company concurrently on one event loop
+            # (bounded by MAX_CONCURRENT_FETCHES); saves to DB with verbose output
+            run_crawler_async(save_to_db=True, verbose=True)
+            print(f"[{datetime.now()}] Triggered crawl finished successfully.")
+        except Exception as e:
+            print(f"[{datetime.now()}] Triggered crawl failed: {e}", file=sys.stderr)
+        finally:
+            with _STATE_LOCK:
+                _CRAWL_STATE["running"] = False
 
 def run_server(port=8000):
+    threading.Thread(target=_crawl_worker, name="crawl-worker", daemon=True).start()
     server_address = ('', port)
-    httpd = HTTPServer(server_address, CrawlerRequestHandler)
+    # One thread per connection, so a kept-alive client cannot block others
+    httpd = ThreadingHTTPServer(server_address, CrawlerRequestHandler)
     print(f"Scraper server listening on port {port}...")
     httpd.serve_forever()
 
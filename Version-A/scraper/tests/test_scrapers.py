@@ -2,11 +2,17 @@
 Tests for the BambooHR scraper.
 """
 
-import pytest
+import asyncio
+import time
+from datetime import datetime
 from unittest.mock import Mock, patch
 
+import httpx
+import orjson
+import pytest
+
 from src.models import Job
-from src.scrapers import BambooHRScraper, ENTRY_LEVEL_KEYWORDS
+from src.scrapers import BambooHRScraper, ENTRY_LEVEL_KEYWORDS, TokenBucket
 
 
 class TestBambooHRScraper:
@@ -72,6 +78,19 @@ class TestEntryLevelDetection:
         scraper = BambooHRScraper("https://test.bamboohr.com/careers")
         assert scraper._is_entry_level("Director of Engineering") is False
     
+    def test_rejects_senior_title_with_entry_keyword(self):
+        """Test that a seniority marker wins over an entry-level keyword."""
+        scraper = BambooHRScraper("https://test.bamboohr.com/careers")
+        assert scraper._is_entry_level("Senior Associate") is False
+        assert scraper._is_entry_level("Sr. Analyst I") is False
+        assert scraper._is_entry_level("Head of Graduate Recruiting") is False
+    
+    def test_seniority_markers_match_whole_words(self):
+        """Test that words merely containing a marker are not rejected."""
+        scraper = BambooHRScraper("https://test.bamboohr.com/careers")
+        assert scraper._is_entry_level("Staffing Coordinator, Entry Level") is True
+        assert scraper._is_entry_level("Junior Analyst", "Leadership Office") is True
+    
     def test_case_insensitive(self):
         """Test that detection is case-insensitive."""
         scraper = BambooHRScraper("https://test.bamboohr.com/careers")
@@ -79,6 +98,40 @@ class TestEntryLevelDetection:
         assert scraper._is_entry_level("JUNIOR developer") is True
 
 
+class TestTokenBucket:
+    """Tests for the shared per-host rate limiter."""
+    
+    def test_acquire_waits_once_burst_is_spent(self):
+        """Test that requests beyond the burst are spaced by 1/rate seconds."""
+        bucket = TokenBucket(rate=20.0)
+        start = time.monotonic()
+        for _ in range(3):
+            bucket.acquire()
+        elapsed = time.monotonic() - start
+        assert 0.09 <= elapsed < 0.5
+    
+    def test_acquire_async_waits_once_burst_is_spent(self):
+        """Test that async callers are spaced by 1/rate seconds too."""
+        bucket = TokenBucket(rate=20.0)
+        
+        async def acquire_three():
+            for _ in range(3):
+                await bucket.acquire_async()
+        
+        start = time.monotonic()
+        asyncio.run(acquire_three())
+        elapsed = time.monotonic() - start
+        assert 0.09 <= elapsed < 0.5
+    
+    def test_scrapers_for_same_host_share_a_bucket(self):
+        """Test that scrapers for one host share a rate limiter."""
+        first = BambooHRScraper("https://shared.bamboohr.com/careers")
+        second = BambooHRScraper("https://shared.bamboohr.com/careers/")
+        other = BambooHRScraper("https://other.bamboohr.com/careers")
+        assert first._bucket is second._bucket
+        assert first._bucket is not other._bucket
+
+
 class TestLocationParsing:
     """Tests for location string building."""
     
@@ -126,11 +179,11 @@ class TestLocationParsing:
 class TestFetchJobs:
     """Tests for the fetch_jobs method."""
     
-    @patch("src.scrapers.requests.Session.get")
+    @patch("src.scrapers.httpx.Client.get")
     def test_fetch_jobs_parses_response(self, mock_get):
         """Test that fetch_jobs correctly parses the API response."""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "meta": {"totalCount": 2},
             "result": [
                 {
@@ -152,7 +205,7 @@ class TestFetchJobs:
                     "isRemote": False,
                 },
             ],
-        }
+        })
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
         
@@ -171,11 +224,11 @@ class TestFetchJobs:
         assert jobs[1].title == "Senior Manager"
         assert jobs[1].is_entry_level is False
     
-    @patch("src.scrapers.requests.Session.get")
+    @patch("src.scrapers.httpx.Client.get")
     def test_fetch_entry_level_jobs_filters(self, mock_get):
         """Test that fetch_entry_level_jobs only returns entry-level jobs."""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "meta": {"totalCount": 2},
             "result": [
                 {
@@ -197,7 +250,7 @@ class TestFetchJobs:
                     "isRemote": False,
                 },
             ],
-        }
+        })
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
         
@@ -206,6 +259,104 @@ class TestFetchJobs:
         
         assert len(jobs) == 1
         assert jobs[0].title == "Junior Developer"
+    
+    @patch("src.scrapers.time.sleep")
+    def test_fetch_jobs_retries_unavailable(self, mock_sleep):
+        """Test that fetch_jobs retries a 503 and parses the eventual 200."""
+        statuses = iter([503, 200])
+        
+        def handler(request):
+            status = next(statuses)
+            if status != 200:
+                return httpx.Response(status)
+            return httpx.Response(200, json={
+                "result": [{"id": "3", "jobOpeningName": "Junior Analyst"}],
+            })
+        
+        scraper = BambooHRScraper("https://retry.bamboohr.com/careers", rate_limit_seconds=0)
+        scraper.client = httpx.Client(transport=httpx.MockTransport(handler))
+        jobs = scraper.fetch_jobs()
+        
+        assert [job.title for job in jobs] == ["Junior Analyst"]
+        mock_sleep.assert_called_once()
+    
+    def test_fetch_jobs_async_uses_shared_client(self):
+        """Test that fetch_jobs_async requests the list endpoint on the given client."""
+        requested = []
+        
+        def handler(request):
+            requested.append(str(request.url))
+            return httpx.Response(200, json={
+                "result": [
+                    {
+                        "id": "7",
+                        "jobOpeningName": "Data Analyst I",
+                        "departmentLabel": "Finance",
+                        "location": {},
+                        "atsLocation": {},
+                    },
+                ],
+            })
+        
+        async def fetch():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await scraper.fetch_jobs_async(client)
+        
+        scraper = BambooHRScraper("https://test.bamboohr.com/careers", rate_limit_seconds=0)
+        jobs = asyncio.run(fetch())
+        
+        assert requested == ["https://test.bamboohr.com/careers/list"]
+        assert len(jobs) == 1
+        assert jobs[0].url == "https://test.bamboohr.com/careers/7"
+        assert jobs[0].is_entry_level is True
+    
+    def test_fetch_jobs_async_reuses_jobs_on_not_modified(self):
+        """Test that an unchanged listing is revalidated with its ETag, not re-parsed."""
+        sent_etags = []
+        
+        def handler(request):
+            sent_etags.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, headers={"ETag": '"v1"'}, json={
+                "result": [{"id": "7", "jobOpeningName": "Data Analyst I"}],
+            })
+        
+        async def fetch_twice():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return (
+                    await scraper.fetch_jobs_async(client),
+                    await scraper.fetch_jobs_async(client),
+                )
+        
+        scraper = BambooHRScraper("https://test.bamboohr.com/careers", rate_limit_seconds=0)
+        first, second = asyncio.run(fetch_twice())
+        
+        assert sent_etags == [None, '"v1"']
+        assert second == first
+        assert second[0].title == "Data Analyst I"
+    
+    @patch("src.scrapers.RETRY_BACKOFF_SECONDS", 0)
+    def test_fetch_jobs_async_retries_unavailable(self):
+        """Test that fetch_jobs_async retries a 429 and parses the eventual 200."""
+        statuses = iter([429, 200])
+        
+        def handler(request):
+            status = next(statuses)
+            if status != 200:
+                return httpx.Response(status)
+            return httpx.Response(200, json={
+                "result": [{"id": "3", "jobOpeningName": "Junior Analyst"}],
+            })
+        
+        async def fetch():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await scraper.fetch_jobs_async(client)
+        
+        scraper = BambooHRScraper("https://retry-async.bamboohr.com/careers", rate_limit_seconds=0)
+        jobs = asyncio.run(fetch())
+        
+        assert [job.title for job in jobs] == ["Junior Analyst"]
 
 
 class TestJobModel:
@@ -231,3 +382,24 @@ class TestJobModel:
             company_name="TestCo",
         )
         assert str(job) == "Data Analyst at TestCo"
+    
+    def test_job_from_db_row(self):
+        """Test building a Job from a database row."""
+        row = (
+            "Junior Analyst",
+            "https://example.com/job/3",
+            "3",
+            "TestCo",
+            "Finance",
+            None,
+            "Full-Time",
+            True,
+            datetime(2024, 1, 1),
+        )
+        job = Job.from_db_row(row)
+        assert job.title == "Junior Analyst"
+        assert job.is_entry_level is True
+        assert job.first_seen_at == datetime(2024, 1, 1)
+        assert job.external_id == "3"
+        assert job.posted_at is None
+        assert str(job) == "Junior Analyst at TestCo"
@@ -42,7 +42,7 @@ docker compose -f docker-compose.prod.yml up -d
 echo "💾 Initializing Database Schema..."
 # Wait for DB to be ready
 sleep 10
-docker compose -f docker-compose.prod.yml exec -T db psql -U jobcrawler -d job_crawler -f /docker-entrypoint-initdb.d/001_v2_init.sql || echo "⚠️ Schema might already exist (ignoring error)"
+docker compose -f docker-compose.prod.yml exec -T db sh -c 'for f in /docker-entrypoint-initdb.d/*.sql; do psql -U jobcrawler -d job_crawler -f "$f"; done' || echo "⚠️ Schema might already exist (ignoring error)"
 
 echo "✅ Deployment Complete!"
 echo "   Web: http://localhost:80"
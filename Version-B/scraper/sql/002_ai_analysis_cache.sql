@@ -0,0 +1,22 @@
+-- Job Crawler Version B - AI Analysis Cache
+-- =========================================
+-- Content-addressed cache of Gemini results so unchanged job postings
+-- are not re-analyzed on every crawl.
+
+-- ============================================
+-- AI ANALYSIS CACHE TABLE
+-- ============================================
+-- hash: sha256 of the job title + description text sent to the model
+CREATE TABLE IF NOT EXISTS ai_analysis_cache (
+    hash TEXT PRIMARY KEY,
+    
+    -- AI Results (same meaning as the v2_jobs ai_* columns)
+    is_entry_level BOOLEAN,
+    confidence INTEGER,
+    min_years_experience INTEGER,
+    reasoning TEXT,
+    
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+COMMENT ON TABLE ai_analysis_cache IS 'Version B: Gemini analysis results keyed by job content hash';
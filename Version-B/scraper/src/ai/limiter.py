@@ -1,10 +1,34 @@
 import logging
 import asyncio
-from aiolimiter import AsyncLimiter
+import time
 from ..config import get_settings
 
 logger = logging.getLogger(__name__)
 
+_S = get_settings()
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously from time.monotonic().
+    Callers reserve a token up front and sleep off any deficit, so waiters are
+    served in arrival order. No lock is needed: there is no await between
+    reading and updating the bucket, and the event loop is single-threaded.
+    """
+
+    def __init__(self, rate: float, capacity: float, period: float = 60.0):
+        self.capacity = capacity
+        self._rate = rate / period  # tokens per second
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self._rate)
+
 class RateLimiter:
     """
     Manages API quota for Google Gemini.
@@ -14,10 +38,9 @@ class RateLimiter:
     _instance = None
     
     def __init__(self):
-        settings = get_settings()
         # 15 requests per 60 seconds
-        self.limit = settings.AI_REQUESTS_PER_MINUTE
-        self.limiter = AsyncLimiter(self.limit, 60)
+        self.limit = _S.AI_REQUESTS_PER_MINUTE
+        self.limiter = TokenBucket(self.limit, self.limit)
         logger.info(f"AI Rate Limiter initialized: {self.limit} RPM")
 
     @classmethod
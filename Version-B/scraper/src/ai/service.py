@@ -1,25 +1,114 @@
+import asyncio
+import hashlib
 import json
 import logging
-import google.generativeai as genai
-from typing import Optional, Dict, Any
+import re
+from typing import Optional, Dict, Any, List, TypedDict
 from ..config import get_settings
+from ..database import AnalysisCacheRepository
 from ..models import Job
 from .limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# Bound once at import; settings never change for the life of the process
+_S = get_settings()
+
+# Compiled once at import. Title seniority is already handled by PreFilter,
+# so only an explicit multi-year requirement in the description rejects here
+# (words like "senior" or "lead" appear in plenty of entry-level descriptions).
+# The number must be followed by "experience" within a couple of words, so
+# company history ("over 25 years", "10 years of growth") does not match;
+# the lookbehind leaves the upper end of ranges like "3-5 years" alone.
+_REJECT_RE = re.compile(
+    r"(?<![-–])\b(?:[5-9]|[1-9]\d)\+?\s*(?:years|yrs)['’]?(?:\s+of)?\s+(?:\w+\s+){0,2}experience",
+    re.IGNORECASE,
+)
+_ACCEPT_RE = re.compile(r"\b(?:intern(?:ship)?|new grad(?:uate)?|junior|entry[- ]level)\b", re.IGNORECASE)
+
+class AnalysisResult(TypedDict):
+    """Per-job entry of a batched analysis response."""
+    external_id: str
+    is_entry_level: bool
+    confidence: int
+    min_years_experience: int
+    reasoning: str
+
 class AIService:
     """
     Service for analyzing job descriptions using Google Gemini.
     """
+
+    # Shared by every instance so the SDK client and its connections are built once
+    _model = None
+
+    # Prompt templates, filled with str.format (literal JSON braces are doubled)
+    _PROMPT_TEMPLATE = """
+        You are a strict recruiter filtering jobs for a New Graduate (0-2 years experience).
+        
+        Analyze this job description:
+        Title: {title}
+        Company: {company} (Placeholder)
+        
+        --- DESCRIPTION START ---
+        {description} 
+        --- DESCRIPTION END ---
+        
+        Task: Determine if this job is suitable for an entry-level candidate (0-2 years).
+        
+        Rules:
+        1. "Preferred" skills are NOT requirements. Ignore "3+ years preferred" if "0 years required".
+        2. "3+ years required" -> REJECT (is_entry_level: false).
+        3. "0-3 years" or "1-3 years" -> ACCEPT (is_entry_level: true).
+        4. Masters/PhD requirements -> REJECT (unless generic "or equivalent experience").
+        5. Internship -> ACCEPT.
+        
+        Output JSON format:
+        {{
+          "is_entry_level": boolean,
+          "confidence": int, // 0-100
+          "min_years_experience": int, // 0 if none stated
+          "reasoning": "string (max 100 chars)"
+        }}
+        """
+
+    _BATCH_PROMPT_TEMPLATE = """
+        You are a strict recruiter filtering jobs for a New Graduate (0-2 years experience).
+        
+        Task: For EACH job below, determine if it is suitable for an entry-level candidate (0-2 years).
+        
+        Rules:
+        1. "Preferred" skills are NOT requirements. Ignore "3+ years preferred" if "0 years required".
+        2. "3+ years required" -> REJECT (is_entry_level: false).
+        3. "0-3 years" or "1-3 years" -> ACCEPT (is_entry_level: true).
+        4. Masters/PhD requirements -> REJECT (unless generic "or equivalent experience").
+        5. Internship -> ACCEPT.
+        
+        Output a JSON array with exactly one object per job:
+        [{{
+          "external_id": "string (copied from the input)",
+          "is_entry_level": boolean,
+          "confidence": int, // 0-100
+          "min_years_experience": int, // 0 if none stated
+          "reasoning": "string (max 100 chars)"
+        }}]
+        
+        Jobs (JSON):
+        {payload}
+        """
     
     def __init__(self):
-        self.settings = get_settings()
         self.limiter = RateLimiter.get_instance()
+        self.user_agent = _S.USER_AGENT
         
-        # Configure Gemini
-        genai.configure(api_key=self.settings.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        if AIService._model is None:
+            # Imported here: the SDK is slow to load and only needed once analysis runs
+            import google.generativeai as genai
+
+            # Configure Gemini
+            genai.configure(api_key=_S.GEMINI_API_KEY)
+            AIService._model = genai.GenerativeModel('gemini-1.5-flash')
+        self.model = AIService._model
         
     async def analyze_job(self, job: Job) -> Job:
         """
@@ -31,6 +120,16 @@ class AIService:
             job.ai_reasoning = "Missing description text"
             return job
 
+        if self._keyword_screen(job):
+            return job
+
+        # Reuse a previous analysis of identical content
+        content_hash = self._content_hash(job)
+        cached = await self._cache_lookup([content_hash])
+        if content_hash in cached:
+            self._apply_result(job, cached[content_hash])
+            return job
+
         # Construct the prompt
         prompt = self._build_prompt(job)
         
@@ -48,11 +147,8 @@ class AIService:
             result = json.loads(response.text)
             
             # Update job object
-            job.ai_is_entry_level = result.get('is_entry_level')
-            job.ai_confidence_score = result.get('confidence')
-            job.ai_years_required = result.get('min_years_experience')
-            job.ai_reasoning = result.get('reasoning')
-            job.analysis_status = 'analyzed'
+            self._apply_result(job, result)
+            await self._cache_store({content_hash: job})
             
             logger.info(f"AI Analysis for {job.title}: Entry Level? {job.ai_is_entry_level} ({job.ai_confidence_score}%)")
             
@@ -63,35 +159,191 @@ class AIService:
             
         return job
 
+    async def analyze_jobs(self, jobs: List[Job]) -> List[Job]:
+        """
+        Analyzes many jobs, packing up to AI_BATCH_SIZE jobs into each Gemini request
+        and keeping up to AI_MAX_CONCURRENT_REQUESTS requests in flight.
+        Each request costs a single rate limiter token regardless of batch size.
+        """
+        pending = []
+        for job in jobs:
+            if job.raw_description_text:
+                if not self._keyword_screen(job):
+                    pending.append(job)
+            else:
+                logger.warning(f"Job {job.external_id} has no description text. Skipping AI analysis.")
+                job.analysis_status = 'failed'
+                job.ai_reasoning = "Missing description text"
+
+        # Reuse previous analyses of identical content. Jobs sharing content
+        # (one posting listed in several locations, or reposted) are analyzed
+        # once, through the first of them, and the result is copied to the rest.
+        hashes = [self._content_hash(job) for job in pending]
+        cached = await self._cache_lookup(hashes)
+        uncached: Dict[str, List[Job]] = {}
+        for content_hash, job in zip(hashes, pending):
+            if content_hash in cached:
+                self._apply_result(job, cached[content_hash])
+            else:
+                uncached.setdefault(content_hash, []).append(job)
+        if cached:
+            cache_hits = len(pending) - sum(len(group) for group in uncached.values())
+            logger.info(f"AI cache hits: {cache_hits}/{len(pending)}")
+
+        to_send = [group[0] for group in uncached.values()]
+        batch_size = max(1, _S.AI_BATCH_SIZE)
+        # Batches run concurrently; the rate limiter still caps requests per minute
+        request_sem = asyncio.Semaphore(max(1, _S.AI_MAX_CONCURRENT_REQUESTS))
+
+        async def run_batch(batch: List[Job]) -> None:
+            async with request_sem:
+                await self._analyze_batch(batch)
+
+        await asyncio.gather(*[
+            run_batch(to_send[start:start + batch_size])
+            for start in range(0, len(to_send), batch_size)
+        ])
+
+        for analyzed, *duplicates in uncached.values():
+            for job in duplicates:
+                self._copy_analysis(analyzed, job)
+
+        await self._cache_store({content_hash: group[0] for content_hash, group in uncached.items()})
+
+        return jobs
+
+    @staticmethod
+    def _content_hash(job: Job) -> str:
+        """
+        Hash of the content sent to the model, used as the analysis cache key.
+        """
+        content = f"{job.title}\n{job.raw_description_text}"
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    @staticmethod
+    def _apply_result(job: Job, result: Dict[str, Any]) -> None:
+        """
+        Copies an analysis result (from Gemini or the cache) onto the job.
+        """
+        job.ai_is_entry_level = result.get('is_entry_level')
+        job.ai_confidence_score = result.get('confidence')
+        job.ai_years_required = result.get('min_years_experience')
+        job.ai_reasoning = result.get('reasoning')
+        job.analysis_status = 'analyzed'
+
+    @staticmethod
+    def _copy_analysis(source: Job, job: Job) -> None:
+        """
+        Copies the analysis outcome of one job onto another with the same content.
+        """
+        job.ai_is_entry_level = source.ai_is_entry_level
+        job.ai_confidence_score = source.ai_confidence_score
+        job.ai_years_required = source.ai_years_required
+        job.ai_reasoning = source.ai_reasoning
+        job.analysis_status = source.analysis_status
+
+    async def _cache_lookup(self, hashes: List[str]) -> Dict[str, dict]:
+        """
+        Fetches cached results; cache errors never block analysis.
+        """
+        try:
+            return await AnalysisCacheRepository.get_many(hashes)
+        except Exception as e:
+            logger.warning(f"AI cache lookup failed: {e}")
+            return {}
+
+    async def _cache_store(self, jobs_by_hash: Dict[str, Job]) -> None:
+        """
+        Saves successful analyses; cache errors never block analysis.
+        """
+        entries = [
+            (content_hash, job.ai_is_entry_level, job.ai_confidence_score,
+             job.ai_years_required, job.ai_reasoning)
+            for content_hash, job in jobs_by_hash.items()
+            if job.analysis_status == 'analyzed'
+        ]
+        try:
+            await AnalysisCacheRepository.put_many(entries)
+        except Exception as e:
+            logger.warning(f"AI cache store failed: {e}")
+
+    def _keyword_screen(self, job: Job) -> bool:
+        """
+        Decides obvious cases without calling Gemini.
+        Returns True if the job was classified here and needs no AI call.
+        """
+        reject = _REJECT_RE.search(job.raw_description_text[:2000])
+        if reject:
+            job.prefilter_rejected = True
+            job.prefilter_reason = f"Description requires '{reject.group(0)}'"
+            job.ai_is_entry_level = False
+            job.analysis_status = 'skipped'
+            return True
+
+        accept = _ACCEPT_RE.search(job.title)
+        if accept:
+            job.ai_is_entry_level = True
+            job.ai_reasoning = f"Title contains entry-level keyword: '{accept.group(0)}'"
+            job.analysis_status = 'analyzed'
+            return True
+
+        return False
+
+    async def _analyze_batch(self, jobs: List[Job]) -> None:
+        """
+        Sends one multi-job prompt and dispatches the results back by external_id.
+        """
+        prompt = self._build_batch_prompt(jobs)
+
+        await self.limiter.acquire()
+
+        try:
+            response = await self.model.generate_content_async(
+                prompt,
+                generation_config={
+                    "response_mime_type": "application/json",
+                    "response_schema": list[AnalysisResult],
+                }
+            )
+            results = {str(r.get('external_id')): r for r in json.loads(response.text)}
+        except Exception as e:
+            logger.error(f"Batch AI Analysis failed for {len(jobs)} jobs: {e}")
+            for job in jobs:
+                job.analysis_status = 'failed'
+                job.ai_reasoning = f"AI Error: {str(e)}"
+            return
+
+        for job in jobs:
+            result = results.get(job.external_id)
+            if result is None:
+                job.analysis_status = 'failed'
+                job.ai_reasoning = "AI Error: job missing from batch response"
+                continue
+
+            self._apply_result(job, result)
+
+        logger.info(f"Batch AI Analysis complete for {len(jobs)} jobs ({len(results)} results)")
+
+    def _build_batch_prompt(self, jobs: List[Job]) -> str:
+        """
+        Constructs a prompt that analyzes several jobs at once.
+        """
+        payload = json.dumps([
+            {
+                "external_id": job.external_id,
+                "title": job.title,
+                "description": job.raw_description_text[:4000],
+            }
+            for job in jobs
+        ])
+        return self._BATCH_PROMPT_TEMPLATE.format(payload=payload)
+
     def _build_prompt(self, job: Job) -> str:
         """
         Constructs the analysis prompt.
         """
-        return f"""
-        You are a strict recruiter filtering jobs for a New Graduate (0-2 years experience).
-        
-        Analyze this job description:
-        Title: {job.title}
-        Company: {self.settings.USER_AGENT} (Placeholder)
-        
-        --- DESCRIPTION START ---
-        {job.raw_description_text[:10000]} 
-        --- DESCRIPTION END ---
-        
-        Task: Determine if this job is suitable for an entry-level candidate (0-2 years).
-        
-        Rules:
-        1. "Preferred" skills are NOT requirements. Ignore "3+ years preferred" if "0 years required".
-        2. "3+ years required" -> REJECT (is_entry_level: false).
-        3. "0-3 years" or "1-3 years" -> ACCEPT (is_entry_level: true).
-        4. Masters/PhD requirements -> REJECT (unless generic "or equivalent experience").
-        5. Internship -> ACCEPT.
-        
-        Output JSON format:
-        {{
-          "is_entry_level": boolean,
-          "confidence": int, // 0-100
-          "min_years_experience": int, // 0 if none stated
-          "reasoning": "string (max 100 chars)"
-        }}
-        """
+        return self._PROMPT_TEMPLATE.format(
+            title=job.title,
+            company=self.user_agent,
+            description=job.raw_description_text[:10000],
+        )
@@ -1,3 +1,4 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
 from typing import Optional
@@ -14,14 +15,24 @@ class Settings(BaseSettings):
     DATABASE_NAME: str = "job_crawler"
     DATABASE_USER: str = "jobcrawler"
     DATABASE_PASSWORD: str
+    DB_POOL_MIN: int = 2  # Connections opened up front
+    DB_POOL_MAX: Optional[int] = None  # Defaults to db_pool_max_size below
+    DB_STATEMENT_CACHE_SIZE: int = 1024
+    DB_MAX_INACTIVE_LIFETIME: float = 300.0  # Seconds before an idle connection is closed
+    DB_BATCH_SIZE: int = 500  # Jobs per upsert from the crawl pipeline
+    DB_BATCH_INTERVAL: float = 5.0  # Seconds idle before a partial batch is saved
+    DB_COPY_THRESHOLD: int = 200  # Upserts larger than this go through COPY; must be < DB_BATCH_SIZE
     
     # Google Gemini AI Configuration
     GEMINI_API_KEY: str
     AI_REQUESTS_PER_MINUTE: int = 15  # Default to free tier limit
+    AI_BATCH_SIZE: int = 10  # Jobs analyzed per Gemini request
+    AI_MAX_CONCURRENT_REQUESTS: int = 5  # Gemini requests in flight at once
     
     # Scraper Configuration
     MAX_CONCURRENT_FETCHES: int = 5
-    REQUEST_DELAY: float = 1.0  # Seconds
+    MAX_CONCURRENT_COMPANIES: int = 3
+    REQUESTS_PER_SECOND: float = 1.0  # Per host, shared by all concurrent fetches
     REQUEST_TIMEOUT: int = 30   # Seconds
     USER_AGENT: str = "JobCrawler/2.0 (Entry Level Job Finder; +http://localhost)"
     
@@ -34,12 +45,32 @@ class Settings(BaseSettings):
         extra="ignore"
     )
 
+    @model_validator(mode="after")
+    def _check_copy_threshold(self) -> "Settings":
+        """
+        The pipeline never upserts more than DB_BATCH_SIZE jobs at once, so a
+        threshold at or above it would leave the COPY path unreachable.
+        """
+        if self.DB_COPY_THRESHOLD >= self.DB_BATCH_SIZE:
+            raise ValueError(
+                f"DB_COPY_THRESHOLD ({self.DB_COPY_THRESHOLD}) must be below "
+                f"DB_BATCH_SIZE ({self.DB_BATCH_SIZE})"
+            )
+        return self
+
     @property
     def database_url(self) -> str:
         """Constructs the asyncpg connection string."""
         return f"postgresql://{self.DATABASE_USER}:{self.DATABASE_PASSWORD}@{self.DATABASE_HOST}:{self.DATABASE_PORT}/{self.DATABASE_NAME}"
 
-@lru_cache
+    @property
+    def db_pool_max_size(self) -> int:
+        """Pool size: DB_POOL_MAX, or enough for every concurrent company's fetches."""
+        if self.DB_POOL_MAX is not None:
+            return self.DB_POOL_MAX
+        return max(10, self.MAX_CONCURRENT_FETCHES * self.MAX_CONCURRENT_COMPANIES)
+
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Returns a cached instance of the settings.
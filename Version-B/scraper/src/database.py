@@ -1,32 +1,134 @@
-import asyncpg
+import functools
 import logging
-from typing import Optional, List
+import operator
+import sqlparse
+from typing import TYPE_CHECKING, Optional, List, Dict
 from contextlib import asynccontextmanager
 from .config import get_settings
 from .models import Job, Company
 
+if TYPE_CHECKING:
+    # asyncpg is imported on first pool creation, not at module import
+    import asyncpg
+
 logger = logging.getLogger(__name__)
 
+_S = get_settings()
+
+# Columns written by JobRepository.upsert_jobs, in tuple order
+JOB_UPSERT_COLUMNS = (
+    'company_id', 'external_id', 'title', 'url',
+    'location', 'department', 'employment_type',
+    'raw_description_text',
+    'analysis_status', 'prefilter_rejected', 'prefilter_reason',
+)
+
+# Job -> record tuple in JOB_UPSERT_COLUMNS order (column names match Job fields)
+_job_record = operator.attrgetter(*JOB_UPSERT_COLUMNS)
+
+# Conflict handling shared by every job upsert path
+JOB_UPSERT_CONFLICT_SQL = """
+    ON CONFLICT (company_id, external_id) 
+    DO UPDATE SET
+        title = EXCLUDED.title,
+        url = EXCLUDED.url,
+        last_seen_at = NOW(),
+        -- Only update content if it was null
+        raw_description_text = COALESCE(v2_jobs.raw_description_text, EXCLUDED.raw_description_text),
+        analysis_status = CASE 
+            WHEN v2_jobs.analysis_status = 'pending' THEN EXCLUDED.analysis_status
+            ELSE v2_jobs.analysis_status 
+        END
+    -- Skip no-op rewrites of unchanged jobs (each one costs a new row version
+    -- and WAL); last_seen_at is still refreshed at most once a day
+    WHERE v2_jobs.title IS DISTINCT FROM EXCLUDED.title
+       OR v2_jobs.url IS DISTINCT FROM EXCLUDED.url
+       OR (v2_jobs.raw_description_text IS NULL AND EXCLUDED.raw_description_text IS NOT NULL)
+       OR (v2_jobs.analysis_status = 'pending' AND EXCLUDED.analysis_status <> 'pending')
+       OR v2_jobs.last_seen_at < NOW() - INTERVAL '1 day'
+    RETURNING (xmax = 0) AS is_new
+"""
+
+# Rows per multi-row INSERT (11 params each, well under Postgres' 32767 limit)
+UPSERT_CHUNK_ROWS = 500
+
+# Hot queries prepared once per pooled connection (see _hot_connection_class)
+HOT_SQL: Dict[str, str] = {
+    "get_active_companies": """
+        SELECT * FROM v2_companies 
+        WHERE is_active = TRUE
+    """,
+    "get_company_by_id": """
+        SELECT * FROM v2_companies WHERE id = $1
+    """,
+    "get_cached_analyses": """
+        SELECT hash, is_entry_level, confidence, min_years_experience, reasoning
+        FROM ai_analysis_cache
+        WHERE hash = ANY($1::text[])
+    """,
+}
+
+# Schema files split into statements, keyed by path (parsed once per process)
+_SCHEMA_STATEMENTS: Dict[str, List[str]] = {}
+
+@functools.cache
+def _hot_connection_class() -> type:
+    """
+    Builds the pool's connection class on first use, so asyncpg is only
+    imported once a pool is actually created.
+    """
+    import asyncpg
+
+    class HotConnection(asyncpg.Connection):
+        """
+        Pool connection that keeps handles to its prepared HOT_SQL statements,
+        so hot queries skip the server-side parse/plan step.
+        """
+        prepared: Dict[str, asyncpg.prepared_stmt.PreparedStatement]
+
+    return HotConnection
+
+async def _prepare_hot_statements(conn: "asyncpg.Connection") -> None:
+    """
+    Pool init hook: prepares every HOT_SQL statement on a new connection.
+    """
+    import asyncpg
+
+    conn.prepared = {}
+    try:
+        for name, sql in HOT_SQL.items():
+            conn.prepared[name] = await conn.prepare(sql)
+    except asyncpg.UndefinedTableError:
+        # Schema not created yet (e.g. before init_schema); prepare on first use
+        conn.prepared.clear()
+
 class Database:
     """
     Manages the asyncpg connection pool for the application.
     Singleton pattern ensures only one pool is created.
     """
-    _pool: Optional[asyncpg.Pool] = None
+    _pool: Optional["asyncpg.Pool"] = None
 
     @classmethod
-    async def get_pool(cls) -> asyncpg.Pool:
+    async def get_pool(cls) -> "asyncpg.Pool":
         """
         Get the existing connection pool or create a new one.
         """
         if cls._pool is None:
-            settings = get_settings()
+            import asyncpg
+
             try:
                 cls._pool = await asyncpg.create_pool(
-                    dsn=settings.database_url,
-                    min_size=1,
-                    max_size=10,
-                    command_timeout=60
+                    dsn=_S.database_url,
+                    min_size=_S.DB_POOL_MIN,
+                    max_size=_S.db_pool_max_size,
+                    max_inactive_connection_lifetime=_S.DB_MAX_INACTIVE_LIFETIME,
+                    statement_cache_size=_S.DB_STATEMENT_CACHE_SIZE,
+                    command_timeout=60,
+                    # Queries are short; JIT compilation only adds latency
+                    server_settings={'jit': 'off'},
+                    connection_class=_hot_connection_class(),
+                    init=_prepare_hot_statements
                 )
                 logger.info("Database connection pool initialized.")
             except Exception as e:
@@ -53,18 +155,35 @@ class Database:
         async with pool.acquire() as conn:
             yield conn
 
+    @staticmethod
+    async def statement(conn: "asyncpg.Connection", name: str) -> "asyncpg.prepared_stmt.PreparedStatement":
+        """
+        Returns the connection's prepared statement for a HOT_SQL query.
+        """
+        stmt = conn.prepared.get(name)
+        if stmt is None:
+            stmt = conn.prepared[name] = await conn.prepare(HOT_SQL[name])
+        return stmt
+
     @classmethod
     async def init_schema(cls, schema_path: str = "sql/001_v2_init.sql"):
         """
         Initialize the database schema from a SQL file.
         """
         try:
-            with open(schema_path, 'r') as f:
-                schema_sql = f.read()
+            statements = _SCHEMA_STATEMENTS.get(schema_path)
+            if statements is None:
+                with open(schema_path, 'r') as f:
+                    schema_sql = f.read()
+                statements = [s for s in sqlparse.split(schema_sql) if s.strip()]
+                _SCHEMA_STATEMENTS[schema_path] = statements
             
+            # One statement per execute, all-or-nothing
             async with cls.connection() as conn:
-                await conn.execute(schema_sql)
-                logger.info(f"Schema initialized from {schema_path}")
+                async with conn.transaction():
+                    for statement in statements:
+                        await conn.execute(statement)
+                logger.info(f"Schema initialized from {schema_path} ({len(statements)} statements)")
         except FileNotFoundError:
             logger.error(f"Schema file not found: {schema_path}")
             raise
@@ -78,20 +197,17 @@ class CompanyRepository:
     @staticmethod
     async def get_active_companies() -> List[Company]:
         async with Database.connection() as conn:
-            rows = await conn.fetch("""
-                SELECT * FROM v2_companies 
-                WHERE is_active = TRUE
-            """)
-            return [Company(**dict(row)) for row in rows]
+            stmt = await Database.statement(conn, "get_active_companies")
+            rows = await stmt.fetch()
+            return [Company.model_construct(**dict(row)) for row in rows]
 
     @staticmethod
     async def get_by_id(company_id: int) -> Optional[Company]:
         async with Database.connection() as conn:
-            row = await conn.fetchrow("""
-                SELECT * FROM v2_companies WHERE id = $1
-            """, company_id)
+            stmt = await Database.statement(conn, "get_company_by_id")
+            row = await stmt.fetchrow(company_id)
             if row:
-                return Company(**dict(row))
+                return Company.model_construct(**dict(row))
             return None
 
 class JobRepository:
@@ -106,62 +222,98 @@ class JobRepository:
             return 0
             
         async with Database.connection() as conn:
-            # Prepare data for bulk insert
-            values = []
-            for job in jobs:
-                values.append((
-                    job.company_id,
-                    job.external_id,
-                    job.title,
-                    job.url,
-                    job.location,
-                    job.department,
-                    job.employment_type,
-                    job.raw_description_text,
-                    job.raw_description_html,
-                    job.analysis_status,
-                    job.prefilter_rejected,
-                    job.prefilter_reason
-                ))
-            
-            # Using execute_many for bulk upsert is complex with ON CONFLICT
-            # So we loop or construct a large query. For simplicity and robustness with <1000 jobs, 
-            # we can use executemany with a smart query or loop.
-            # Here we'll use a loop with a prepared statement for simplicity, or executemany.
-            # Since we need to know how many were *new*, normal executemany doesn't tell us easily.
-            # We'll stick to a loop for now or simple "INSERT ... ON CONFLICT DO NOTHING" count.
-            
-            # Let's count insertions
-            inserted_count = 0
+            # Large batches (e.g. first crawl of a new company) go through binary
+            # COPY; smaller ones are cheaper as a multi-row INSERT
+            if len(jobs) > _S.DB_COPY_THRESHOLD:
+                return await JobRepository._upsert_via_copy(conn, jobs)
             
-            stmt = await conn.prepare("""
-                INSERT INTO v2_jobs (
-                    company_id, external_id, title, url, 
-                    location, department, employment_type,
-                    raw_description_text, raw_description_html,
-                    analysis_status, prefilter_rejected, prefilter_reason,
-                    last_seen_at
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, NOW())
-                ON CONFLICT (company_id, external_id) 
-                DO UPDATE SET
-                    title = EXCLUDED.title,
-                    url = EXCLUDED.url,
-                    last_seen_at = NOW(),
-                    -- Only update content if it was null
-                    raw_description_text = COALESCE(v2_jobs.raw_description_text, EXCLUDED.raw_description_text),
-                    analysis_status = CASE 
-                        WHEN v2_jobs.analysis_status = 'pending' THEN EXCLUDED.analysis_status
-                        ELSE v2_jobs.analysis_status 
-                    END
-                RETURNING (xmax = 0) AS is_new
+            return await JobRepository._upsert_via_values(conn, jobs)
+
+    @staticmethod
+    async def _upsert_via_values(conn: "asyncpg.Connection", jobs: List[Job]) -> int:
+        """
+        Upserts rows with one multi-row INSERT ... ON CONFLICT per chunk,
+        all in a single transaction. Returns number of new jobs inserted.
+        """
+        # ON CONFLICT DO UPDATE cannot touch the same row twice in one
+        # statement, so keep only the last entry per (company_id, external_id)
+        values = list({(job.company_id, job.external_id): _job_record(job) for job in jobs}.values())
+        width = len(JOB_UPSERT_COLUMNS)
+        columns = ', '.join(JOB_UPSERT_COLUMNS)
+
+        inserted_count = 0
+        async with conn.transaction():
+            for start in range(0, len(values), UPSERT_CHUNK_ROWS):
+                chunk = values[start:start + UPSERT_CHUNK_ROWS]
+                placeholders = ', '.join(
+                    '(' + ', '.join(f'${i * width + j + 1}' for j in range(width)) + ', NOW())'
+                    for i in range(len(chunk))
+                )
+                args = [v for val in chunk for v in val]
+                rows = await conn.fetch(
+                    f"INSERT INTO v2_jobs ({columns}, last_seen_at) VALUES {placeholders}"
+                    + JOB_UPSERT_CONFLICT_SQL,
+                    *args
+                )
+                inserted_count += sum(1 for row in rows if row['is_new'])
+
+        return inserted_count
+
+    @staticmethod
+    async def _upsert_via_copy(conn: "asyncpg.Connection", jobs: List[Job]) -> int:
+        """
+        Bulk-loads rows with binary COPY into a temp staging table, then merges
+        them into v2_jobs with a single INSERT ... SELECT ... ON CONFLICT.
+        Returns number of new jobs inserted.
+        """
+        columns = ', '.join(JOB_UPSERT_COLUMNS)
+        async with conn.transaction():
+            # Column-only copy of v2_jobs: no id default, no constraints
+            await conn.execute(f"""
+                CREATE TEMP TABLE v2_jobs_staging ON COMMIT DROP AS
+                SELECT {columns} FROM v2_jobs WITH NO DATA
             """)
-            
-            for val in values:
-                try:
-                    is_new = await stmt.fetchval(*val)
-                    if is_new:
-                        inserted_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to upsert job {val[2]}: {e}")
-            
-            return inserted_count
+            await conn.copy_records_to_table(
+                'v2_jobs_staging', records=map(_job_record, jobs), columns=JOB_UPSERT_COLUMNS
+            )
+            # DISTINCT ON: a batch may list the same job twice, which
+            # ON CONFLICT DO UPDATE cannot apply within one statement
+            rows = await conn.fetch(f"""
+                INSERT INTO v2_jobs ({columns}, last_seen_at)
+                SELECT DISTINCT ON (company_id, external_id) {columns}, NOW()
+                FROM v2_jobs_staging
+            """ + JOB_UPSERT_CONFLICT_SQL)
+        return sum(1 for row in rows if row['is_new'])
+
+class AnalysisCacheRepository:
+    """Data access for cached AI analysis results, keyed by content hash."""
+
+    @staticmethod
+    async def get_many(hashes: List[str]) -> Dict[str, dict]:
+        """
+        Returns cached results for the given hashes (missing hashes are omitted).
+        """
+        if not hashes:
+            return {}
+
+        async with Database.connection() as conn:
+            stmt = await Database.statement(conn, "get_cached_analyses")
+            rows = await stmt.fetch(hashes)
+            return {row['hash']: dict(row) for row in rows}
+
+    @staticmethod
+    async def put_many(entries: List[tuple]) -> None:
+        """
+        Stores (hash, is_entry_level, confidence, min_years_experience, reasoning) rows.
+        Existing hashes are left untouched.
+        """
+        if not entries:
+            return
+
+        async with Database.connection() as conn:
+            await conn.executemany("""
+                INSERT INTO ai_analysis_cache (
+                    hash, is_entry_level, confidence, min_years_experience, reasoning
+                ) VALUES ($1, $2, $3, $4, $5)
+                ON CONFLICT (hash) DO NOTHING
+            """, entries)
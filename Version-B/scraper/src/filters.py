@@ -1,4 +1,5 @@
 import logging
+from typing import List, Optional
 from .models import Job
 
 logger = logging.getLogger(__name__)
@@ -20,22 +21,54 @@ class PreFilter:
         "graduate", "grad", "apprentice"
     ]
 
+    # Reject keywords as word sets, built once. A keyword only matches as a
+    # whole word (or run of words), i.e. between whitespace or the ends of the
+    # title, so one split plus hash lookups replaces scanning for each keyword.
+    _REJECT_WORDS = frozenset(k for k in REJECT_KEYWORDS if " " not in k)
+    _REJECT_PHRASES = [k.split() for k in REJECT_KEYWORDS if " " in k]
+    _REJECT_FIRST_WORDS = _REJECT_WORDS | frozenset(p[0] for p in _REJECT_PHRASES)
+
     @classmethod
     def filter(cls, job: Job) -> Job:
         """
         Applies filtering logic to a job.
         Updates job.prefilter_rejected and job.prefilter_reason.
         """
-        title_lower = job.title.lower()
-        
-        # Check for rejection keywords
-        for keyword in cls.REJECT_KEYWORDS:
-            # Word boundary check is better, but simple substring is faster and usually sufficient for these specific words
-            # E.g., "Senior" in "Senior Engineer"
-            if f" {keyword} " in f" {title_lower} " or title_lower.startswith(f"{keyword} ") or title_lower.endswith(f" {keyword}"):
-                job.prefilter_rejected = True
-                job.prefilter_reason = f"Title contains rejection keyword: '{keyword}'"
-                job.analysis_status = 'skipped'
-                return job
+        if job.prefilter_rejected:
+            return job
+
+        reason = cls.reject_reason(job.title)
+        if reason:
+            job.prefilter_rejected = True
+            job.prefilter_reason = reason
+            job.analysis_status = 'skipped'
                 
         return job
+
+    @classmethod
+    def reject_reason(cls, title: str) -> Optional[str]:
+        """
+        Returns why a title is rejected, or None if it passes.
+        Cheap enough to call on raw listing data before building a Job.
+        """
+        words = title.lower().split()
+        # Fast path: most titles share no word with any keyword
+        if cls._REJECT_FIRST_WORDS.isdisjoint(words):
+            return None
+
+        for i, word in enumerate(words):
+            if word in cls._REJECT_WORDS:
+                return f"Title contains rejection keyword: '{word}'"
+            for phrase in cls._REJECT_PHRASES:
+                if words[i:i + len(phrase)] == phrase:
+                    return f"Title contains rejection keyword: '{' '.join(phrase)}'"
+        return None
+
+    @classmethod
+    def filter_batch(cls, jobs: List[Job]) -> List[Job]:
+        """
+        Applies filter() to every job, returning the same list.
+        """
+        for job in jobs:
+            cls.filter(job)
+        return jobs
@@ -1,10 +1,13 @@
 import logging
 import asyncio
+from typing import Dict
 from aiohttp import web
 from .pipeline import Pipeline
 from .scrapers.greenhouse import GreenhouseScraper
 from .models import Company
 from .database import Database, CompanyRepository
+from .config import get_settings
+from .ai.service import AIService
 
 # Configure logging
 logging.basicConfig(
@@ -13,17 +16,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global lock to prevent concurrent crawls
-CRAWL_LOCK = asyncio.Lock()
+# Per-company locks: a company is never crawled twice at once, but
+# different companies (and overlapping crawl requests) run in parallel
+CRAWL_LOCKS: Dict[int, asyncio.Lock] = {}
 
 async def handle_crawl(request):
     """
     Trigger a crawl for all active companies.
     """
-    if CRAWL_LOCK.locked():
-        return web.json_response({'status': 'error', 'message': 'Crawl already in progress'}, status=409)
-
-    # Start crawl in background task
+    # Start crawl in background task; companies already being crawled are skipped
     asyncio.create_task(run_background_crawl())
     
     return web.json_response({'status': 'accepted', 'message': 'Crawl started'}, status=202)
@@ -32,36 +33,56 @@ async def run_background_crawl():
     """
     Orchestrate the crawl process for all companies.
     """
-    async with CRAWL_LOCK:
-        logger.info("Starting background crawl...")
-        try:
-            # Initialize DB pool
-            await Database.get_pool()
-            
-            # Get active companies
-            companies = await CompanyRepository.get_active_companies()
-            logger.info(f"Found {len(companies)} active companies to crawl.")
-            
-            for company in companies:
-                logger.info(f"Processing company: {company.name}")
-                
-                # Select scraper strategy based on company config
-                # Currently only Greenhouse is fully implemented in V2
-                if company.strategy == 'greenhouse' or 'greenhouse.io' in company.careers_url:
-                    scraper = GreenhouseScraper(company)
-                    pipeline = Pipeline(scraper)
-                    await pipeline.run()
-                else:
-                    logger.warning(f"No V2 scraper strategy for {company.name} ({company.strategy}). Skipping.")
-            
-            logger.info("Background crawl completed successfully.")
-            
-        except Exception as e:
-            logger.error(f"Background crawl failed: {e}")
-        finally:
-            # Don't close the pool here if we want the server to keep running
-            # But maybe good practice to keep connections healthy
-            pass
+    logger.info("Starting background crawl...")
+    try:
+        # Initialize DB pool
+        await Database.get_pool()
+        
+        # Get active companies
+        companies = await CompanyRepository.get_active_companies()
+        logger.info(f"Found {len(companies)} active companies to crawl.")
+        
+        # Companies are crawled concurrently, a bounded number at a time,
+        # sharing one AI service
+        company_sem = asyncio.Semaphore(get_settings().MAX_CONCURRENT_COMPANIES)
+        ai_service = AIService()
+        results = await asyncio.gather(
+            *[crawl_company(company, company_sem, ai_service) for company in companies],
+            return_exceptions=True
+        )
+        for company, result in zip(companies, results):
+            if isinstance(result, Exception):
+                logger.error(f"Crawl failed for {company.name}: {result}")
+        
+        logger.info("Background crawl completed successfully.")
+        
+    except Exception as e:
+        logger.error(f"Background crawl failed: {e}")
+    finally:
+        # Don't close the pool here if we want the server to keep running
+        # But maybe good practice to keep connections healthy
+        pass
+
+async def crawl_company(company: Company, company_sem: asyncio.Semaphore, ai_service: AIService):
+    """
+    Run the pipeline for one company once a crawl slot is free.
+    """
+    lock = CRAWL_LOCKS.setdefault(company.id, asyncio.Lock())
+    if lock.locked():
+        logger.info(f"Crawl already in progress for {company.name}. Skipping.")
+        return
+
+    async with lock, company_sem:
+        logger.info(f"Processing company: {company.name}")
+        
+        # Select scraper strategy based on company config
+        # Currently only Greenhouse is fully implemented in V2
+        if company.strategy == 'greenhouse' or 'greenhouse.io' in company.careers_url:
+            scraper = GreenhouseScraper(company)
+            pipeline = Pipeline(scraper, ai_service=ai_service)
+            await pipeline.run()
+        else:
+            logger.warning(f"No V2 scraper strategy for {company.name} ({company.strategy}). Skipping.")
 
 async def health_check(request):
     return web.Response(text="OK")
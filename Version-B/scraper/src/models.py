@@ -34,7 +34,6 @@ class Job(BaseModel):
     
     # Content
     raw_description_text: Optional[str] = None
-    raw_description_html: Optional[str] = None
     
     # AI Analysis Fields
     analysis_status: Literal['pending', 'analyzed', 'failed', 'skipped'] = 'pending'
@@ -1,9 +1,9 @@
 import asyncio
 import logging
-from typing import List, Set
+from typing import List, Optional, Set
 from .models import Job, Company, CrawlResult
 from .filters import PreFilter
-from .database import Database, JobRepository
+from .database import JobRepository
 from .scrapers.base import BaseScraper
 from .config import get_settings
 from .ai.service import AIService
@@ -14,84 +14,165 @@ class Pipeline:
     """
     Orchestrates the crawling process:
     Scrape -> PreFilter -> Detail Fetch -> AI Analysis -> DB Save
+
+    Stages run concurrently and hand jobs along asyncio queues
+    (fetch_q -> ai_q -> db_q), so AI analysis and DB writes start while
+    details are still being fetched. A None on a queue ends a worker.
     """
-    
-    def __init__(self, scraper: BaseScraper):
+
+    def __init__(self, scraper: BaseScraper, ai_service: Optional[AIService] = None):
         self.scraper = scraper
         self.settings = get_settings()
-        self.db = Database()
-        self.ai_service = AIService()
-        
+        # Pass a shared service when running many pipelines at once
+        self.ai_service = ai_service or AIService()
+
     async def run(self) -> CrawlResult:
         """
         Executes the full pipeline for a company.
         """
         result = CrawlResult(company_id=self.scraper.company.id)
-        
+
+        fetch_q: asyncio.Queue = asyncio.Queue()
+        ai_q: asyncio.Queue = asyncio.Queue()
+        db_q: asyncio.Queue = asyncio.Queue()
+        fetch_workers_count = max(1, self.settings.MAX_CONCURRENT_FETCHES)
+        ai_workers_count = max(1, self.settings.AI_MAX_CONCURRENT_REQUESTS)
+
         try:
-            # 1. Scrape all jobs (Discovery Phase)
-            logger.info(f"Starting crawl for {self.scraper.company.name}")
+            # One HTTP session (and connection pool) for listing and detail fetches
             async with self.scraper:
-                jobs = await self.scraper.scrape()
-                
-            result.jobs_found = len(jobs)
-            logger.info(f"Found {len(jobs)} jobs for {self.scraper.company.name}")
-            
-            # 2. Process jobs
-            # Semaphores:
-            # - Fetching: Limit based on config to be polite
-            # - AI: Limit to 1 concurrent task to respect rate limiter smoothly
-            fetch_sem = asyncio.Semaphore(self.settings.MAX_CONCURRENT_FETCHES)
-            ai_sem = asyncio.Semaphore(1) 
-            
-            async def process_job(job: Job):
-                # 2a. Pre-filter
-                PreFilter.filter(job)
-                if job.prefilter_rejected:
-                    logger.debug(f"Skipped {job.title}: {job.prefilter_reason}")
-                    return job
-
-                # 2b. Fetch Details
-                async with fetch_sem:
-                    try:
-                        async with self.scraper: 
-                            await self.scraper.fetch_job_detail(job)
-                    except Exception as e:
-                        logger.error(f"Failed to fetch details for {job.title}: {e}")
-                        # Don't fail completely, just skip AI
-                        job.analysis_status = 'failed'
-                        return job
-
-                # 2c. AI Analysis (if details exist)
-                if job.raw_description_text:
-                    async with ai_sem:
-                        try:
-                            await self.ai_service.analyze_job(job)
-                        except Exception as e:
-                            logger.error(f"AI step failed for {job.title}: {e}")
-                            job.analysis_status = 'failed'
-                
-                return job
-
-            # Run processing concurrently
-            # Note: We process all jobs found. In a real large-scale system, 
-            # we might want to batch this or use a proper queue.
-            processed_jobs = await asyncio.gather(*[process_job(job) for job in jobs])
-            
-            # 3. Save to Database
-            # We save ALL jobs, even rejected ones, to avoid re-crawling them
-            repo = JobRepository()
-            jobs_added = await repo.upsert_jobs(processed_jobs)
-            result.jobs_added = jobs_added
-            
+                fetch_workers = [
+                    asyncio.create_task(self._fetch_worker(fetch_q, ai_q, db_q))
+                    for _ in range(fetch_workers_count)
+                ]
+                ai_workers = [
+                    asyncio.create_task(self._ai_worker(ai_q, db_q))
+                    for _ in range(ai_workers_count)
+                ]
+                db_writer = asyncio.create_task(self._db_writer(db_q, result))
+
+                # Shut stages down in order even if discovery or a worker
+                # fails, so everything already found is still analyzed and
+                # saved and no stage is left waiting for its sentinel
+                try:
+                    await self._discover(fetch_q, result)
+                finally:
+                    errors = [
+                        await self._stop_stage(fetch_q, fetch_workers),
+                        await self._stop_stage(ai_q, ai_workers),
+                        await self._stop_stage(db_q, [db_writer]),
+                    ]
+                    error = next((e for e in errors if e is not None), None)
+                    if error is not None:
+                        raise error
+
             # Calculate stats
             result.pages_crawled = 1 # TODO: Update scraper to return page count
-            
-            logger.info(f"Crawl finished for {self.scraper.company.name}. Added {jobs_added} jobs.")
-            
+
+            logger.info(f"Crawl finished for {self.scraper.company.name}. Added {result.jobs_added} jobs.")
+
         except Exception as e:
             logger.error(f"Crawl failed for {self.scraper.company.name}: {e}")
             result.status = 'failed'
             result.error_message = str(e)
-            
+
         return result
+
+    @staticmethod
+    async def _stop_stage(queue: asyncio.Queue, workers: List[asyncio.Task]) -> Optional[BaseException]:
+        """
+        Sends one None per worker and waits for all of them, even if some
+        fail, so the next stage is only stopped once nothing more can reach
+        its queue. Returns the first worker error, if any.
+        """
+        for _ in workers:
+            await queue.put(None)
+        outcomes = await asyncio.gather(*workers, return_exceptions=True)
+        return next((o for o in outcomes if isinstance(o, BaseException)), None)
+
+    async def _discover(self, fetch_q: asyncio.Queue, result: CrawlResult) -> None:
+        """
+        Stage 1: streams the job list, queueing each job as its page arrives.
+        """
+        logger.info(f"Starting crawl for {self.scraper.company.name}")
+        async for job in self.scraper.scrape_iter():
+            await fetch_q.put(job)
+            result.jobs_found += 1
+
+        logger.info(f"Found {result.jobs_found} jobs for {self.scraper.company.name}")
+
+    async def _fetch_worker(self, fetch_q: asyncio.Queue, ai_q: asyncio.Queue, db_q: asyncio.Queue) -> None:
+        """
+        Stage 2: pre-filters jobs and fetches details for the survivors.
+        Jobs that need no AI analysis go straight to the DB writer.
+        """
+        while (job := await fetch_q.get()) is not None:
+            # 2a. Pre-filter (scrapers may already have rejected the job)
+            PreFilter.filter(job)
+            if job.prefilter_rejected:
+                logger.debug(f"Skipped {job.title}: {job.prefilter_reason}")
+                await db_q.put(job)
+                continue
+
+            # 2b. Fetch Details
+            try:
+                await self.scraper.fetch_job_detail(job)
+            except Exception as e:
+                logger.error(f"Failed to fetch details for {job.title}: {e}")
+                # Don't fail completely, just skip AI
+                job.analysis_status = 'failed'
+                await db_q.put(job)
+                continue
+
+            await (ai_q if job.raw_description_text else db_q).put(job)
+
+    async def _ai_worker(self, ai_q: asyncio.Queue, db_q: asyncio.Queue) -> None:
+        """
+        Stage 3: analyzes jobs in batches of AI_BATCH_SIZE to save API quota.
+        A partial batch is only sent once the queue is shutting down.
+        """
+        batch_size = max(1, self.settings.AI_BATCH_SIZE)
+        done = False
+        while not done:
+            batch: List[Job] = []
+            while len(batch) < batch_size:
+                job = await ai_q.get()
+                if job is None:
+                    done = True
+                    break
+                batch.append(job)
+            if not batch:
+                continue
+
+            try:
+                await self.ai_service.analyze_jobs(batch)
+            except Exception as e:
+                logger.error(f"AI step failed for {self.scraper.company.name}: {e}")
+                for job in batch:
+                    job.analysis_status = 'failed'
+            for job in batch:
+                await db_q.put(job)
+
+    async def _db_writer(self, db_q: asyncio.Queue, result: CrawlResult) -> None:
+        """
+        Stage 4: saves jobs in batches of up to DB_BATCH_SIZE, flushing early
+        when nothing arrives for DB_BATCH_INTERVAL seconds.
+        We save ALL jobs, even rejected ones, to avoid re-crawling them.
+        """
+        repo = JobRepository()
+        pending: List[Job] = []
+        done = False
+        while not done:
+            try:
+                job: Optional[Job] = await asyncio.wait_for(db_q.get(), self.settings.DB_BATCH_INTERVAL)
+            except asyncio.TimeoutError:
+                job = None
+            else:
+                if job is None:
+                    done = True
+                else:
+                    pending.append(job)
+
+            if pending and (job is None or len(pending) >= self.settings.DB_BATCH_SIZE):
+                result.jobs_added += await repo.upsert_jobs(pending)
+                pending = []
@@ -1,10 +1,12 @@
-import aiohttp
-import asyncio
+import httpx
 import logging
+import orjson
 from abc import ABC, abstractmethod
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Dict, AsyncIterator
+from urllib.parse import urlparse
 from ..models import Job, Company
 from ..config import get_settings
+from ..ai.limiter import TokenBucket
 
 logger = logging.getLogger(__name__)
 
@@ -13,47 +15,81 @@ class BaseScraper(ABC):
     Abstract base class for all company scrapers.
     Handles HTTP sessions, rate limiting, and common logic.
     """
+
+    # One limiter per host, shared by every scraper and concurrent fetch
+    _host_limiters: Dict[str, TokenBucket] = {}
     
     def __init__(self, company: Company):
         self.company = company
         self.settings = get_settings()
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.client: Optional[httpx.AsyncClient] = None
         
     async def __aenter__(self):
-        timeout = aiohttp.ClientTimeout(total=self.settings.REQUEST_TIMEOUT)
-        self.session = aiohttp.ClientSession(
+        # HTTP/2 multiplexes concurrent requests to a host over one TLS
+        # connection; HTTP/1.1 hosts fall back to the keep-alive pool
+        limits = httpx.Limits(
+            max_connections=self.settings.MAX_CONCURRENT_FETCHES,
+            max_keepalive_connections=self.settings.MAX_CONCURRENT_FETCHES,
+            keepalive_expiry=30
+        )
+        self.client = httpx.AsyncClient(
+            http2=True,
+            limits=limits,
             headers={"User-Agent": self.settings.USER_AGENT},
-            timeout=timeout
+            timeout=httpx.Timeout(self.settings.REQUEST_TIMEOUT),
+            follow_redirects=True
         )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+
+    async def fetch_text(self, url: str, params: Optional[dict] = None) -> str:
+        """
+        Fetch a URL and return the response body as text (e.g. HTML).
+        """
+        response = await self._request(url, params)
+        return response.text
+
+    async def fetch_json(self, url: str, params: Optional[dict] = None) -> Any:
+        """
+        Fetch a URL and return the decoded JSON body.
+        """
+        response = await self._request(url, params)
+        return orjson.loads(response.content)
 
-    async def fetch(self, url: str, params: Optional[dict] = None) -> str:
+    async def _request(self, url: str, params: Optional[dict] = None) -> httpx.Response:
         """
-        Fetch a URL with rate limiting and error handling.
-        Returns the response text (HTML or JSON).
+        GET a URL with rate limiting and error handling.
         """
-        if not self.session:
+        if not self.client:
             raise RuntimeError("Scraper session not initialized. Use 'async with scraper:'")
             
-        # Basic rate limiting (per scraper instance)
-        await asyncio.sleep(self.settings.REQUEST_DELAY)
+        # Rate limiting (per host, across all scrapers)
+        await self._limiter_for(url).acquire()
         
         try:
-            async with self.session.get(url, params=params) as response:
-                response.raise_for_status()
-                # Determine content type to return correct format
-                content_type = response.headers.get('Content-Type', '')
-                if 'application/json' in content_type:
-                    return await response.json()
-                return await response.text()
+            response = await self.client.get(url, params=params)
+            response.raise_for_status()
+            return response
         except Exception as e:
             logger.error(f"Error fetching {url}: {e}")
             raise
 
+    def _limiter_for(self, url: str) -> TokenBucket:
+        """
+        Returns the shared limiter for the URL's host, creating it on first use.
+        """
+        host = urlparse(url).netloc
+        limiter = BaseScraper._host_limiters.get(host)
+        if limiter is None:
+            # Capacity 1: requests are spaced out, never sent in a burst
+            limiter = TokenBucket(self.settings.REQUESTS_PER_SECOND, 1, period=1.0)
+            BaseScraper._host_limiters[host] = limiter
+        return limiter
+
     @abstractmethod
     async def scrape(self) -> List[Job]:
         """
@@ -62,6 +98,14 @@ class BaseScraper(ABC):
         """
         pass
 
+    async def scrape_iter(self) -> AsyncIterator[Job]:
+        """
+        Yields jobs as they are discovered. Scrapers that paginate should
+        override this to yield page by page; by default it wraps scrape().
+        """
+        for job in await self.scrape():
+            yield job
+
     @abstractmethod
     async def fetch_job_detail(self, job: Job) -> Job:
         """
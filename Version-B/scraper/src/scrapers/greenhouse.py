@@ -1,6 +1,7 @@
-from typing import List, Dict, Any, Tuple, Optional
-from bs4 import BeautifulSoup
+from typing import List, Dict, Any, Tuple, Optional, AsyncIterator
+from selectolax.lexbor import LexborHTMLParser
 from ..models import Job
+from ..filters import PreFilter
 from .base import BaseScraper
 from .strategies import OffsetPagination
 
@@ -20,10 +21,25 @@ class GreenhouseScraper(BaseScraper):
         """
         return await self.pagination.fetch_all_jobs()
 
+    def scrape_iter(self) -> AsyncIterator[Job]:
+        """
+        Streams jobs from the pagination strategy, page by page.
+        """
+        return self.pagination.iter_jobs()
+
     def parse_jobs(self, data: Any) -> List[Job]:
         """
         Parses the JSON response from Greenhouse API.
         """
+        jobs, _ = self.parse_jobs_with_count(data)
+        return jobs
+
+    def parse_jobs_with_count(self, data: Any) -> Tuple[List[Job], int]:
+        """
+        Parses the JSON response and also returns how many listings it held.
+        Malformed listings are skipped, so the count can exceed len(jobs);
+        pagination needs the raw count to tell a full page from the last one.
+        """
         # Greenhouse often returns JSON like: { "jobs": [ ... ], "meta": { ... } }
         # Or sometimes just a list if it's a specific endpoint
         
@@ -33,40 +49,66 @@ class GreenhouseScraper(BaseScraper):
         elif isinstance(data, list):
             jobs_data = data
             
+        # model_construct skips validation: the fields below are already
+        # the right types, and validating every listing dominates parse time
+        company_id = self.company.id
+        reject_reason_for = PreFilter.reject_reason
         jobs = []
         for item in jobs_data:
-            job = Job(
-                company_id=self.company.id,
-                external_id=str(item.get('id')),
-                title=item.get('title', 'Unknown'),
-                url=item.get('absolute_url', ''),
-                location=item.get('location', {}).get('name'),
-                department=item.get('departments', [{}])[0].get('name'),
+            try:
+                title = item['title']
+                external_id = str(item['id'])
+                url = item['absolute_url']
+            except KeyError:
+                continue  # Malformed listing
+
+            reject_reason = reject_reason_for(title)
+            if reject_reason:
+                # Rejected titles are still saved (so they are not re-crawled),
+                # but need none of the metadata below
+                jobs.append(Job.model_construct(
+                    company_id=company_id,
+                    external_id=external_id,
+                    title=title,
+                    url=url,
+                    prefilter_rejected=True,
+                    prefilter_reason=reject_reason,
+                    analysis_status='skipped'
+                ))
+                continue
+
+            location = item.get('location')
+            departments = item.get('departments')
+            jobs.append(Job.model_construct(
+                company_id=company_id,
+                external_id=external_id,
+                title=title,
+                url=url,
+                location=location.get('name') if location else None,
+                department=departments[0].get('name') if departments else None,
                 first_seen_at=None  # Will be set by DB
-            )
-            jobs.append(job)
+            ))
             
-        return jobs
+        return jobs, len(jobs_data)
 
     async def fetch_job_detail(self, job: Job) -> Job:
         """
         Fetches the full HTML description.
         """
-        html = await self.fetch(job.url)
+        html = await self.fetch_text(job.url)
         
         # Parse HTML to get clean text
-        soup = BeautifulSoup(html, 'lxml')
-        content_div = soup.find('div', id='content') or soup.find('div', id='app_body')
+        tree = LexborHTMLParser(html)
+        content_div = tree.css_first('div#content') or tree.css_first('div#app_body')
         
         if content_div:
             # Remove scripts and styles
-            for script in content_div(["script", "style"]):
+            for script in content_div.css('script, style'):
                 script.decompose()
                 
-            job.raw_description_html = str(content_div)
-            job.raw_description_text = content_div.get_text(separator='\n').strip()
+            job.raw_description_text = content_div.text(separator='\n').strip()
         else:
             # Fallback to whole body if specific div not found
-            job.raw_description_text = soup.get_text(separator='\n').strip()
+            job.raw_description_text = tree.root.text(separator='\n').strip() if tree.root else ''
             
         return job
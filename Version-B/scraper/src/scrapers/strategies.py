@@ -1,6 +1,8 @@
+import asyncio
 import logging
+from collections import deque
 from abc import ABC, abstractmethod
-from typing import List, Optional, Any, Dict
+from typing import List, Optional, Any, Dict, AsyncIterator, Deque, Tuple
 from ..models import Job
 from .base import BaseScraper
 
@@ -14,48 +16,82 @@ class PaginationStrategy(ABC):
         self.scraper = scraper
 
     @abstractmethod
-    async def fetch_all_jobs(self) -> List[Job]:
+    def iter_jobs(self) -> AsyncIterator[Job]:
+        """
+        Yields jobs page by page, as soon as each page is parsed.
+        """
         pass
 
+    async def fetch_all_jobs(self) -> List[Job]:
+        return [job async for job in self.iter_jobs()]
+
 class OffsetPagination(PaginationStrategy):
     """
     Handles offset-based pagination (e.g., ?limit=100&offset=0).
     Common in Greenhouse APIs.
+
+    While pages keep coming back full, up to `prefetch` later pages are
+    requested ahead of time (still paced by the scraper's host limiter).
     """
-    def __init__(self, scraper: BaseScraper, limit_param: str = 'limit', offset_param: str = 'offset', page_size: int = 100):
+    def __init__(self, scraper: BaseScraper, limit_param: str = 'limit', offset_param: str = 'offset', page_size: int = 100, prefetch: int = 3):
         super().__init__(scraper)
         self.limit_param = limit_param
         self.offset_param = offset_param
         self.page_size = page_size
+        self.prefetch = max(1, prefetch)
 
-    async def fetch_all_jobs(self) -> List[Job]:
-        all_jobs = []
-        offset = 0
-        
-        while True:
-            params = {self.limit_param: self.page_size, self.offset_param: offset}
-            logger.info(f"Fetching page with offset {offset} for {self.scraper.company.name}")
-            
-            try:
-                response_data = await self.scraper.fetch(self.scraper.company.careers_url, params=params)
-                jobs = self.scraper.parse_jobs(response_data)
-                
-                if not jobs:
+    async def iter_jobs(self) -> AsyncIterator[Job]:
+        in_flight: Deque[Tuple[int, asyncio.Task]] = deque()
+        next_offset = 0
+
+        def request_next_page():
+            nonlocal next_offset
+            params = {self.limit_param: self.page_size, self.offset_param: next_offset}
+            logger.info(f"Fetching page with offset {next_offset} for {self.scraper.company.name}")
+            task = asyncio.create_task(
+                self.scraper.fetch_json(self.scraper.company.careers_url, params=params)
+            )
+            in_flight.append((next_offset, task))
+            next_offset += self.page_size
+
+        request_next_page()
+        try:
+            while in_flight:
+                offset, task = in_flight.popleft()
+                try:
+                    jobs, listed = self.scraper.parse_jobs_with_count(await task)
+                except Exception as e:
+                    logger.error(f"Pagination failed at offset {offset}: {e}")
                     break
-                    
-                all_jobs.extend(jobs)
-                
-                if len(jobs) < self.page_size:
-                    # Last page reached
+
+                if len(jobs) < listed:
+                    logger.warning(f"Skipped {listed - len(jobs)} malformed listings at offset {offset} for {self.scraper.company.name}")
+
+                # Page size is judged on the listings returned, not the jobs
+                # parsed, so skipped listings cannot end pagination early
+                if not listed:
                     break
-                    
-                offset += self.page_size
-                
-            except Exception as e:
-                logger.error(f"Pagination failed at offset {offset}: {e}")
-                break
-                
-        return all_jobs
+
+                if listed < self.page_size:
+                    # Last page reached; requests past it are cancelled below
+                    for job in jobs:
+                        yield job
+                    break
+
+                # Probably more pages: keep the prefetch window full
+                while len(in_flight) < self.prefetch:
+                    request_next_page()
+
+                for job in jobs:
+                    yield job
+        finally:
+            # Drop prefetched pages past the end (or after an error)
+            for _, task in in_flight:
+                if task.done():
+                    if not task.cancelled():
+                        task.exception()  # mark retrieved
+                else:
+                    task.cancel()
 
 class TokenPagination(PaginationStrategy):
     """
@@ -66,8 +102,7 @@ class TokenPagination(PaginationStrategy):
         super().__init__(scraper)
         self.cursor_param = cursor_param
 
-    async def fetch_all_jobs(self) -> List[Job]:
-        all_jobs = []
+    async def iter_jobs(self) -> AsyncIterator[Job]:
         cursor = None
         
         while True:
@@ -78,11 +113,11 @@ class TokenPagination(PaginationStrategy):
             logger.info(f"Fetching page with cursor {cursor} for {self.scraper.company.name}")
             
             try:
-                response_data = await self.scraper.fetch(self.scraper.company.careers_url, params=params)
+                response_data = await self.scraper.fetch_json(self.scraper.company.careers_url, params=params)
                 jobs, next_cursor = self.scraper.parse_jobs_with_cursor(response_data)
                 
-                if jobs:
-                    all_jobs.extend(jobs)
+                for job in jobs or []:
+                    yield job
                 
                 if not next_cursor or next_cursor == cursor:
                     break
@@ -92,5 +127,3 @@ class TokenPagination(PaginationStrategy):
             except Exception as e:
                 logger.error(f"Pagination failed at cursor {cursor}: {e}")
                 break
-                
-        return all_jobs
@@ -0,0 +1 @@
+# Tests for Job Crawler Version B Scraper
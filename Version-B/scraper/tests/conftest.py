@@ -0,0 +1,10 @@
+"""
+Shared test setup.
+
+Settings require these values; tests never reach the database or Gemini.
+"""
+
+import os
+
+os.environ.setdefault("DATABASE_PASSWORD", "test")
+os.environ.setdefault("GEMINI_API_KEY", "test")
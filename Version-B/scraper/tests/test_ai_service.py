@@ -0,0 +1,62 @@
+"""
+Tests for the AI service keyword screen.
+"""
+
+import pytest
+
+from src.ai.service import AIService
+from src.models import Job
+
+
+def make_job(description: str, title: str = "Software Engineer") -> Job:
+    """Build a job with the given description text."""
+    return Job(
+        company_id=1,
+        external_id="1",
+        url="https://example.com/jobs/1",
+        title=title,
+        raw_description_text=description,
+    )
+
+
+@pytest.fixture
+def service() -> AIService:
+    """An AIService without a Gemini model; the keyword screen needs none."""
+    return AIService.__new__(AIService)
+
+
+class TestKeywordScreen:
+    """Tests for AIService._keyword_screen."""
+    
+    @pytest.mark.parametrize("description", [
+        "Requirements: 5+ years of experience building web services.",
+        "You have 7 years of professional software experience.",
+        "10+ years experience with distributed systems.",
+        "Minimum 6 yrs of relevant work experience.",
+    ])
+    def test_rejects_explicit_experience_requirement(self, service, description):
+        """Test that a multi-year experience requirement rejects the job."""
+        job = make_job(description)
+        assert service._keyword_screen(job) is True
+        assert job.prefilter_rejected is True
+        assert job.ai_is_entry_level is False
+    
+    @pytest.mark.parametrize("description", [
+        "We have been building software for over 25 years.",
+        "Celebrating 10 years of growth, we are hiring new grads.",
+        "For 15 yrs we have served customers across Canada.",
+        "Requirements: 3-5 years of experience preferred, 0 required.",
+        "1+ years of experience with Python is a plus.",
+    ])
+    def test_ignores_company_history_and_short_requirements(self, service, description):
+        """Test that numbers without a multi-year requirement do not reject the job."""
+        job = make_job(description)
+        assert service._keyword_screen(job) is False
+        assert job.prefilter_rejected is False
+    
+    def test_accepts_entry_level_title(self, service):
+        """Test that an entry-level title is classified without Gemini."""
+        job = make_job("Join our team.", title="Junior Developer")
+        assert service._keyword_screen(job) is True
+        assert job.ai_is_entry_level is True
+        assert job.analysis_status == "analyzed"
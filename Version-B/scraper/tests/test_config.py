@@ -0,0 +1,22 @@
+"""
+Tests for application settings.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from src.config import Settings
+
+
+class TestSettings:
+    """Tests for Settings validation."""
+    
+    def test_default_copy_threshold_is_reachable(self):
+        """Test that default batches are large enough to use COPY."""
+        settings = Settings()
+        assert settings.DB_COPY_THRESHOLD < settings.DB_BATCH_SIZE
+    
+    def test_rejects_copy_threshold_at_batch_size(self):
+        """Test that a COPY threshold no batch can exceed is rejected."""
+        with pytest.raises(ValidationError, match="DB_COPY_THRESHOLD"):
+            Settings(DB_BATCH_SIZE=500, DB_COPY_THRESHOLD=500)
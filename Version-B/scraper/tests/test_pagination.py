@@ -0,0 +1,63 @@
+"""
+Tests for the pagination strategies.
+"""
+
+import pytest
+
+from src.models import Company
+from src.scrapers.greenhouse import GreenhouseScraper
+
+
+PAGE_SIZE = 3
+
+
+def make_listing(i: int) -> dict:
+    """Build a well-formed Greenhouse listing."""
+    return {"id": i, "title": f"Software Engineer {i}", "absolute_url": f"https://example.com/jobs/{i}"}
+
+
+@pytest.fixture
+def scraper() -> GreenhouseScraper:
+    """A Greenhouse scraper whose requests are recorded instead of sent."""
+    scraper = GreenhouseScraper(
+        Company(id=1, name="Acme", careers_url="https://example.com/jobs"),
+        page_size=PAGE_SIZE,
+    )
+    scraper.pages = {}
+    scraper.requested = []
+
+    async def fetch_json(url, params=None):
+        scraper.requested.append(params["offset"])
+        return {"jobs": scraper.pages.get(params["offset"], [])}
+
+    scraper.fetch_json = fetch_json
+    return scraper
+
+
+class TestOffsetPagination:
+    """Tests for OffsetPagination.iter_jobs."""
+    
+    async def test_stops_after_short_page(self, scraper):
+        """Test that a page with fewer listings than page_size is the last."""
+        scraper.pages = {0: [make_listing(i) for i in range(3)], 3: [make_listing(3)]}
+        jobs = await scraper.scrape()
+        assert [job.external_id for job in jobs] == ["0", "1", "2", "3"]
+    
+    async def test_malformed_listing_does_not_end_pagination(self, scraper):
+        """Test that a full page with a malformed listing still fetches the next offset."""
+        scraper.pages = {
+            0: [make_listing(0), {"title": "No id or url"}, make_listing(2)],
+            3: [make_listing(3)],
+        }
+        jobs = await scraper.scrape()
+        assert 3 in scraper.requested
+        assert [job.external_id for job in jobs] == ["0", "2", "3"]
+    
+    async def test_all_malformed_page_does_not_end_pagination(self, scraper):
+        """Test that a full page of malformed listings still fetches the next offset."""
+        scraper.pages = {
+            0: [{"title": "Malformed"}] * PAGE_SIZE,
+            3: [make_listing(3)],
+        }
+        jobs = await scraper.scrape()
+        assert [job.external_id for job in jobs] == ["3"]